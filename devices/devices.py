@@ -31,6 +31,8 @@ class Device(abc.ABC):
     appropriately in connect()/close().
     """
 
+    __slots__ = ("name", "_connected")
+
     def __init__(self, name: str):
         self.name = name
         self._connected = False
@@ -69,6 +71,15 @@ class DeviceRegistry:
         self.valves: Dict[str, Device] = {}
         self.light_beds: Dict[str, Device] = {}
         self.uv_detectors: Dict[str, Device] = {}
+        # Single hashed dispatch for _mapping_for instead of a chained compare
+        self._maps: Dict[str, Dict[str, Device]] = {
+            "pumps": self.pumps,
+            "liquid_handlers": self.liquid_handlers,
+            "temperature_controllers": self.temperature_controllers,
+            "valves": self.valves,
+            "light_beds": self.light_beds,
+            "uv_detectors": self.uv_detectors,
+        }
 
     def register(self, category: Category, name: str, device: Device) -> None:
         """Register a device into a category. Raises KeyError on duplicate.
@@ -93,16 +104,7 @@ class DeviceRegistry:
         return list(self._mapping_for(category).keys())
 
     def _mapping_for(self, category: Category) -> Dict[str, Device]:
-        if category == "pumps":
-            return self.pumps
-        if category == "liquid_handlers":
-            return self.liquid_handlers
-        if category == "temperature_controllers":
-            return self.temperature_controllers
-        if category == "valves":
-            return self.valves
-        if category == "light_beds":
-            return self.light_beds
-        if category == "uv_detectors":
-            return self.uv_detectors
-        raise KeyError(f"Unknown device category: {category}")
+        try:
+            return self._maps[category]
+        except KeyError:
+            raise KeyError(f"Unknown device category: {category}") from None
@@ -1,187 +1,278 @@
-# ------------------------------------------------------------------------------
-# Software: AUTO_ZAHRT
-# (c) 2024 Andrew Zahrt | Contributors: Scott Laverty, David Polefrone
-# ------------------------------------------------------------------------------
-
-import ctypes
-import re
-from typing import Optional, Tuple, Union
-
-from ..liquid_handler import LiquidHandler
-
-# ---------- low-level helpers (return BYTES; callers decode/parse) ----------
-
-def immediate(unitid: int, command: str) -> bytes:
-    try:
-        lib = ctypes.windll.gsioc32
-        icmd = lib.ICmd
-        rsp = ctypes.create_string_buffer(256)
-        rsplen = ctypes.c_int(256)
-        icmd(unitid, command.encode("utf-8"), rsp, rsplen)
-        return rsp.value
-    except OSError as ex:
-        print("WARNING:", ex)
-        return b"Error"
-
-def buffered(unitid: int, command: str) -> bytes:
-    try:
-        lib = ctypes.windll.gsioc32
-        bcmd = lib.BCmd
-        rsp = ctypes.create_string_buffer(256)
-        rsplen = ctypes.c_int(256)
-        bcmd(unitid, command.encode("utf-8"), rsp, rsplen)
-        return rsp.value
-    except OSError as ex:
-        print("WARNING:", ex)
-        return b"Error"
-
-def _decode(b: bytes) -> str:
-    return b.decode("ascii", "ignore").strip("\x00\r\n ")
-
-# ---------- parsing helpers ----------
-
-_XY_RE = re.compile(r"X[:=\s]*([-\d.]+)\s*[,; ]\s*Y[:=\s]*([-\d.]+)", re.I)
-_XY_SLASH_RE = re.compile(r"^\s*([+-]?\d+(?:\.\d+)?)\s*/\s*([+-]?\d+(?:\.\d+)?)\s*$")
-_Z_RE  = re.compile(r"Z[:=\s]*([-\d.]+)", re.I)
-
-def _parse_xy(s: str) -> Tuple[float, float]:
-    s = s.strip()
-    # Preferred: "123.45/67.89" or "-1/-1"
-    m = _XY_SLASH_RE.match(s)
-    if m:
-        return float(m.group(1)), float(m.group(2))
-    # Also accept "X=.., Y=.." / "X .. Y .."
-    m = _XY_RE.search(s) or re.search(r"X\s*([-\d.]+)\s+Y\s*([-\d.]+)", s, re.I)
-    if m:
-        return float(m.group(1)), float(m.group(2))
-    # Last resort: first two numbers in the string
-    nums = re.findall(r"[+-]?\d+(?:\.\d+)?", s)
-    if len(nums) >= 2:
-        return float(nums[0]), float(nums[1])
-    raise ValueError("Could not parse XY from: %r" % s)
-
-def _parse_z(s: str) -> float:
-    m = _Z_RE.search(s)
-    if not m:
-        m = re.search(r"\b([-\d.]+)\b", s)
-    if not m:
-        raise ValueError("Could not parse Z from: %r" % s)
-    return float(m.group(1))
-
-# ---------- device class ----------
-
-class GX281(LiquidHandler):
-    def __init__(self, name: str, uid: int = 25):
-        super().__init__(name)
-        self.uid = uid
-        self.XMIN, self.XMAX = 0, 700
-        self.YMIN, self.YMAX = 0, 380
-        self.ZMIN, self.ZMAX = 0, 125
-        self.SAFE_Z = 125
-
-        # Default racks
-        self.rack1 = 204
-        self.rack2 = 204
-        self.rack3 = 204
-        self.rack4 = 204
-        self.rack5 = 204
-        self.rack6 = 204
-
-        self._lib_ok = None  # type: Optional[bool]
-
-    # ---- lifecycle ----
-    def connect(self) -> None:
-        if self._connected:
-            return
-        try:
-            _ = ctypes.windll.gsioc32
-            self._lib_ok = True
-        except OSError as ex:
-            self._lib_ok = False
-            raise RuntimeError("gsioc32.dll not available: %s" % ex)
-
-        # handshake: '%' should give some non-empty response
-        rsp = _decode(immediate(self.uid, "%"))
-        if not rsp or rsp.lower().startswith("error"):
-            raise RuntimeError("GX281 (uid %s) not responding to '%%': %r" % (self.uid, rsp))
-        self._connected = True
-
-    def close(self) -> None:
-        self._connected = False
-        print("Disconnected GX281 uid=%s" % self.uid)
-
-    def stop(self) -> None:
-        try:
-            if self.get_z() != self.SAFE_Z:
-                self.move_z(self.SAFE_Z)
-        except Exception as e:
-            print("Stop: failed to park Z:", e)
-
-    # ---- core movement ----
-    def home(self) -> None:
-        self._ensure_conn()
-        buffered(self.uid, "SH")
-
-    def get_xy(self) -> Tuple[float, float]:
-        self._ensure_conn()
-        s = _decode(immediate(self.uid, "X"))
-        x, y = _parse_xy(s)
-        # Treat -1/-1 as "unknown/busy" rather than a parse failure
-        if x == -1.0 and y == -1.0:
-            raise RuntimeError("GX281: XY unknown (-1/-1) — not homed or still moving.")
-        return x, y
-
-    def move_xy(self, x: float, y: float) -> None:
-        self._ensure_conn()
-        if x < self.XMIN: x = self.XMIN
-        if x > self.XMAX: x = self.XMAX
-        if y < self.YMIN: y = self.YMIN
-        if y > self.YMAX: y = self.YMAX
-
-        current_z = self.get_z()  # type: float
-        if current_z < self.SAFE_Z:
-            self.move_z(self.SAFE_Z)
-
-        buffered(self.uid, "SX{}/{}".format(int(x), int(y)))
-
-    def get_z(self) -> float:
-        self._ensure_conn()
-        s = _decode(immediate(self.uid, "Z"))
-        return _parse_z(s)
-
-    def move_z(self, z: float) -> None:
-        self._ensure_conn()
-        if z < self.ZMIN: z = self.ZMIN
-        if z > self.ZMAX: z = self.ZMAX
-        buffered(self.uid, "SZ{}".format(int(z)))
-
-    # ---- misc/status ----
-    def status(self) -> dict:
-        try:
-            x, y = self.get_xy()
-            z = self.get_z()
-            return {"ok": True, "code": "ok", "msg": "X=%.2f Y=%.2f Z=%.2f" % (x, y, z)}
-        except Exception as e:
-            return {"ok": False, "code": "no_response", "msg": str(e)}
-
-    # ---- guard ----
-    def _ensure_conn(self) -> None:
-        if not self._connected:
-            raise RuntimeError("GX281 not connected. Call connect() first.")
-
-# ---------------------- usage ----------------------
-import time
-if __name__ == "__main__":
-    gx = GX281(name="gx281", uid=25)
-    gx.connect()
-    gx.home()
-    time.sleep(5)
-    gx.move_xy(120, 50)
-    time.sleep(5)
-    gx.move_z(80)
-    time.sleep(5)
-    print(gx.status())
-    time.sleep(5)
-    gx.stop()
-    time.sleep(5)
-    gx.close()
+# ------------------------------------------------------------------------------
+# Software: AUTO_ZAHRT
+# (c) 2024 Andrew Zahrt | Contributors: Scott Laverty, David Polefrone
+# ------------------------------------------------------------------------------
+
+import ctypes
+import re
+import sys
+import threading
+from typing import Optional, Tuple, Union
+
+from ..liquid_handler import LiquidHandler
+
+# ---------- low-level helpers (return BYTES; callers decode/parse) ----------
+
+# ICmd/BCmd are resolved once per process with their signatures declared up
+# front, so each call is a plain CFUNCTION invocation instead of a WinDLL
+# attribute walk plus per-argument type inference.
+_ICMD = None
+_BCMD = None
+
+# Pre-encoded command templates: bytes %-formatting skips the f-string build
+# plus the utf-8 encode on every movement command.
+_SX_FMT = b"SX%d/%d"
+_SZ_FMT = b"SZ%d"
+
+# One 256-byte response buffer per thread, reused across calls; saves an
+# allocation + zero-fill per command without assuming single-threaded use.
+_TLS = threading.local()
+
+
+def _rsp_buf() -> ctypes.Array:
+    buf = getattr(_TLS, "buf", None)
+    if buf is None:
+        buf = _TLS.buf = ctypes.create_string_buffer(256)
+    else:
+        ctypes.memset(buf, 0, 256)
+    return buf
+
+
+def _bind() -> None:
+    """Resolve gsioc32.dll and bind ICmd/BCmd once per process."""
+    global _ICMD, _BCMD
+    if _ICMD is not None:
+        return
+    lib = ctypes.windll.gsioc32  # raises OSError when the DLL is missing
+    icmd, bcmd = lib.ICmd, lib.BCmd
+    for fn in (icmd, bcmd):
+        fn.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+        fn.restype = ctypes.c_int
+    _ICMD, _BCMD = icmd, bcmd
+
+
+if sys.platform == "win32":
+    try:
+        _bind()
+    except OSError:
+        pass
+
+
+def immediate(unitid: int, command: Union[str, bytes]) -> bytes:
+    try:
+        if _ICMD is None:
+            _bind()
+        if isinstance(command, str):
+            command = command.encode("utf-8")
+        rsp = _rsp_buf()
+        rsplen = ctypes.c_int(256)
+        _ICMD(unitid, command, rsp, rsplen)
+        return rsp.value
+    except OSError as ex:
+        print("WARNING:", ex)
+        return b"Error"
+
+def buffered(unitid: int, command: Union[str, bytes]) -> bytes:
+    try:
+        if _BCMD is None:
+            _bind()
+        if isinstance(command, str):
+            command = command.encode("utf-8")
+        rsp = _rsp_buf()
+        rsplen = ctypes.c_int(256)
+        _BCMD(unitid, command, rsp, rsplen)
+        return rsp.value
+    except OSError as ex:
+        print("WARNING:", ex)
+        return b"Error"
+
+def _decode(b: bytes) -> str:
+    # Strip the bytes first so only the trimmed slice is decoded; avoids an
+    # intermediate str allocation per reply
+    return b.strip(b"\x00\r\n ").decode("ascii", "ignore")
+
+# ---------- parsing helpers ----------
+
+_XY_RE = re.compile(r"X[:=\s]*([-\d.]+)\s*[,; ]\s*Y[:=\s]*([-\d.]+)", re.I)
+_XY_SLASH_RE = re.compile(r"^\s*([+-]?\d+(?:\.\d+)?)\s*/\s*([+-]?\d+(?:\.\d+)?)\s*$")
+_XY_FALLBACK_RE = re.compile(r"X\s*([-\d.]+)\s+Y\s*([-\d.]+)", re.I)
+_NUM_RE = re.compile(r"[+-]?\d+(?:\.\d+)?")
+_Z_RE  = re.compile(r"Z[:=\s]*([-\d.]+)", re.I)
+_Z_LAST_RESORT_RE = re.compile(r"\b([-\d.]+)\b")
+
+def _parse_xy(s: str) -> Tuple[float, float]:
+    s = s.strip()
+    # Hot path: the documented reply format is "123.45/67.89" or "-1/-1",
+    # which two float() casts handle without touching re at all.
+    if "/" in s:
+        a, _, b = s.partition("/")
+        try:
+            return float(a), float(b)
+        except ValueError:
+            m = _XY_SLASH_RE.match(s)
+            if m:
+                return float(m.group(1)), float(m.group(2))
+    # Also accept "X=.., Y=.." / "X .. Y .."
+    m = _XY_RE.search(s) or _XY_FALLBACK_RE.search(s)
+    if m:
+        return float(m.group(1)), float(m.group(2))
+    # Last resort: first two numbers in the string
+    nums = _NUM_RE.findall(s)
+    if len(nums) >= 2:
+        return float(nums[0]), float(nums[1])
+    raise ValueError("Could not parse XY from: %r" % s)
+
+def _parse_xy_bytes(raw: bytes) -> Tuple[float, float]:
+    """Bytes-level fast path for the documented "x/y" reply.
+
+    float() accepts ASCII bytes directly, so the common case never decodes
+    or touches the regex fallbacks; anything unusual drops through to the
+    string parser.
+    """
+    a, sep, b = raw.strip(b"\x00\r\n ").partition(b"/")
+    if sep:
+        try:
+            return float(a), float(b)
+        except ValueError:
+            pass
+    return _parse_xy(_decode(raw))
+
+def _parse_z(s: str) -> float:
+    # Hot path: the pump usually replies with a bare number ("72.5"), which
+    # float() handles without building a match object.
+    try:
+        return float(s)
+    except ValueError:
+        pass
+    m = _Z_RE.search(s) or _Z_LAST_RESORT_RE.search(s)
+    if not m:
+        raise ValueError("Could not parse Z from: %r" % s)
+    return float(m.group(1))
+
+# ---------- device class ----------
+
+class GX281(LiquidHandler):
+    def __init__(self, name: str, uid: int = 25):
+        super().__init__(name)
+        self.uid = uid
+        self.XMIN, self.XMAX = 0, 700
+        self.YMIN, self.YMAX = 0, 380
+        self.ZMIN, self.ZMAX = 0, 125
+        self.SAFE_Z = 125
+
+        # Default racks
+        self.rack1 = 204
+        self.rack2 = 204
+        self.rack3 = 204
+        self.rack4 = 204
+        self.rack5 = 204
+        self.rack6 = 204
+
+        self._lib_ok = None  # type: Optional[bool]
+        # Z from the last commanded move; lets move_xy skip the get_z()
+        # round trip when we already know where the needle is. None =
+        # unknown (fresh connect, or homing moved the axes under us).
+        self._z_cache = None  # type: Optional[float]
+
+    # ---- lifecycle ----
+    def connect(self) -> None:
+        if self._connected:
+            return
+        try:
+            _ = ctypes.windll.gsioc32
+            self._lib_ok = True
+        except OSError as ex:
+            self._lib_ok = False
+            raise RuntimeError("gsioc32.dll not available: %s" % ex)
+
+        # handshake: '%' should give some non-empty response
+        rsp = _decode(immediate(self.uid, "%"))
+        if not rsp or rsp.lower().startswith("error"):
+            raise RuntimeError("GX281 (uid %s) not responding to '%%': %r" % (self.uid, rsp))
+        self._connected = True
+
+    def close(self) -> None:
+        self._connected = False
+        print("Disconnected GX281 uid=%s" % self.uid)
+
+    def stop(self) -> None:
+        try:
+            if self.get_z() != self.SAFE_Z:
+                self.move_z(self.SAFE_Z)
+        except Exception as e:
+            print("Stop: failed to park Z:", e)
+
+    # ---- core movement ----
+    def home(self) -> None:
+        self._ensure_conn()
+        self._z_cache = None  # homing moves the axes out from under us
+        buffered(self.uid, "SH")
+
+    def get_xy(self) -> Tuple[float, float]:
+        self._ensure_conn()
+        x, y = _parse_xy_bytes(immediate(self.uid, "X"))
+        # Treat -1/-1 as "unknown/busy" rather than a parse failure
+        if x == -1.0 and y == -1.0:
+            raise RuntimeError("GX281: XY unknown (-1/-1) — not homed or still moving.")
+        return x, y
+
+    def move_xy(self, x: float, y: float) -> None:
+        self._ensure_conn()
+        # min/max is a single C call each vs four compare-and-jump branches
+        x = min(max(x, self.XMIN), self.XMAX)
+        y = min(max(y, self.YMIN), self.YMAX)
+
+        # Read-your-writes: only an unknown Z pays the GSIOC round trip
+        current_z = self._z_cache if self._z_cache is not None else self.get_z()
+        if current_z < self.SAFE_Z:
+            self.move_z(self.SAFE_Z)
+
+        buffered(self.uid, _SX_FMT % (int(x), int(y)))
+
+    def get_z(self) -> float:
+        self._ensure_conn()
+        raw = immediate(self.uid, "Z")
+        # Bare-number replies parse straight from bytes; only odd formats
+        # pay the decode + regex fallback
+        try:
+            return float(raw.strip(b"\x00\r\n "))
+        except ValueError:
+            return _parse_z(_decode(raw))
+
+    def move_z(self, z: float) -> None:
+        self._ensure_conn()
+        z = min(max(z, self.ZMIN), self.ZMAX)
+        rsp = buffered(self.uid, _SZ_FMT % int(z))
+        # Cache only on a clean dispatch; an errored write leaves Z unknown
+        self._z_cache = None if rsp == b"Error" else float(int(z))
+
+    # ---- misc/status ----
+    def status(self) -> dict:
+        try:
+            x, y = self.get_xy()
+            z = self.get_z()
+            return {"ok": True, "code": "ok", "msg": "X=%.2f Y=%.2f Z=%.2f" % (x, y, z)}
+        except Exception as e:
+            return {"ok": False, "code": "no_response", "msg": str(e)}
+
+    # ---- guard ----
+    def _ensure_conn(self) -> None:
+        if not self._connected:
+            raise RuntimeError("GX281 not connected. Call connect() first.")
+
+# ---------------------- usage ----------------------
+import time
+if __name__ == "__main__":
+    gx = GX281(name="gx281", uid=25)
+    gx.connect()
+    gx.home()
+    time.sleep(5)
+    gx.move_xy(120, 50)
+    time.sleep(5)
+    gx.move_z(80)
+    time.sleep(5)
+    print(gx.status())
+    time.sleep(5)
+    gx.stop()
+    time.sleep(5)
+    gx.close()
@@ -63,6 +63,37 @@ class ender3:
             if low.startswith("ok"):
                 return
 
+    def write_batch(self, lines, wait=True):
+        """Send several G-code lines in one serial write.
+
+        Marlin queues the lines in order, so this keeps sequential-move
+        semantics while paying one write (and one round trip of latency)
+        for the whole packet. Collects one 'ok' per line when wait=True.
+        """
+        lines = [line.strip() for line in lines if line and line.strip()]
+        if not lines:
+            return
+        if self.verbose:
+            for line in lines:
+                print(">>", line)
+        self.s.write(("\n".join(lines) + "\n").encode("ascii"))
+        if not wait:
+            return
+        pending = len(lines)
+        while pending:
+            resp = self.s.readline().decode("latin1", "ignore").strip()
+            if not resp:
+                continue
+            low = resp.lower()
+            if self.verbose:
+                print("<<", resp)
+            if low.startswith("echo:") or low.startswith("busy:") or low == "wait":
+                continue
+            if low.startswith("error"):
+                raise RuntimeError(f"Printer error: {resp}")
+            if low.startswith("ok"):
+                pending -= 1
+
     # ---------- helpers ----------
     def sync(self):
         """Wait for all queued moves to finish."""
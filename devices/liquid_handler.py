@@ -14,6 +14,8 @@ from .devices import Device
 class LiquidHandler(Device):
     """Abstract high-level interface for liquid handler robots (synchronous)."""
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def home(self) -> None:
         """Home the liquid handler (move axes to known reference)."""
@@ -6,40 +6,17 @@
 # All rights reserved.
 # ------------------------------------------------------------------------------
 
-import ctypes
-import time
-from ctypes import *
+import logging
 
+# Guarded debug logging replaces the old per-call print banners; tracing
+# costs nothing unless a handler is configured at DEBUG level.
+log = logging.getLogger(__name__)
 
-# You can reuse the immediate() and buffered() functions from Approach 1.
-def immediate(unitid, command):
-    try:
-        lib = windll.gsioc32
-        icmd = lib.ICmd
 
-        rsp = ctypes.create_string_buffer(256)
-        rsplen = ctypes.c_int(256)
-
-        icmd(unitid, command.encode('utf-8'), rsp, rsplen)
-        return rsp.value
-    except OSError as ex:
-        print("WARNING:", ex)
-        return "Error"
-
-
-def buffered(unitid, command):
-    try:
-        lib = windll.gsioc32
-        bcmd = lib.BCmd
-
-        rsp = ctypes.create_string_buffer(256)
-        rsplen = ctypes.c_int(256)
-
-        bcmd(unitid, command.encode('utf-8'), rsp, rsplen)
-        return rsp.value
-    except OSError as ex:
-        print("WARNING:", ex)
-        return "Error"
+# The low-level GSIOC helpers live in gx_liquid_handlers; importing them
+# here keeps a single bound copy of ICmd/BCmd per process instead of two
+# parallel definitions drifting apart.
+from .gx_liquid_handlers import buffered, immediate
 
 
 # Replace the gsioc_cmd() with a function call that uses the correct direct function
@@ -62,50 +39,47 @@ class GX281:
         self.rack5 = '204'
         self.rack6 = '204'
 
+        # Last Z we commanded; lets move_xy skip the get_z() GSIOC
+        # round-trip when the needle position is already known.
+        self._last_z = None
+
     ######################################################################
     ### Core movement functions - using direct function calls
 
     def home(self):
-        print("-" * 50)
-        print("Moving GX281 home")
-        print("-" * 50)
+        log.debug("home")
+        self._last_z = None  # homing moves the axes out from under us
         return buffered(self.uid, 'SH')
 
     def get_xy(self):
-        print("-" * 50)
-        print("Locating X and Y")
-        print("-" * 50)
+        log.debug("get_xy")
         return immediate(self.uid, 'X')
 
     def move_xy(self, x, y):
-        print("-" * 50)
-        print(f"Moving GX281 X and Y location {x} and {y}")
-        print("-" * 50)
-        if x < self.XMIN: x = self.XMIN
-        if x > self.XMAX: x = self.XMAX
-        if y < self.YMIN: y = self.YMIN
-        if y > self.YMAX: y = self.YMAX
-
-        current_z = self.get_z()
+        log.debug("move_xy %s %s", x, y)
+        # min/max is a single C call each vs four compare-and-jump branches
+        x = min(max(x, self.XMIN), self.XMAX)
+        y = min(max(y, self.YMIN), self.YMAX)
+
+        # Only probe the device when the last commanded Z is unknown
+        current_z = self._last_z if self._last_z is not None else self.get_z()
         if current_z != 125:
             self.move_z(125)
 
-        print(f"Moving to X: {x}, Y: {y}")
         return buffered(self.uid, f'SX{x}/{y}')
 
     def get_z(self):
-        print("-" * 50)
-        print("Get Z axis of needle")
-        print("-" * 50)
+        log.debug("get_z")
         return immediate(self.uid, 'Z')
 
     def move_z(self, z):
-        print("-" * 50)
-        print(f"Moving to Z: {z}")
-        print("-" * 50)
-        if z < self.ZMIN: z = self.ZMIN
-        if z > self.ZMAX: z = self.ZMAX
-        return buffered(self.uid, f'SZ{z}')
+        log.debug("move_z %s", z)
+        z = min(max(z, self.ZMIN), self.ZMAX)
+        rsp = buffered(self.uid, f'SZ{z}')
+        # Cache only what the controller accepted: a failed SZ must leave Z
+        # unknown so move_xy still probes and parks
+        self._last_z = None if rsp == b"Error" else z
+        return rsp
 
     ######################################################################
     ### Base-level commands; use with caution.
@@ -157,15 +131,11 @@ class GX281:
     ### Core device commands.
 
     def get_device(self):
-        print("-" * 50)
-        print("Getting GX281 Device is available")
-        print("-" * 50)
+        log.debug("get_device")
         return immediate(self.uid, '%')
 
     def read_motor_status(self):
-        print("-" * 50)
-        print("Reading Motor Status")
-        print("-" * 50)
+        log.debug("read_motor_status")
         # xyzp. P parked, R running, E error, I not initialized, X no pump.
         # RRRR while commands pending in buffered S command FIFO.
         return immediate(self.uid, 'M')
@@ -179,15 +149,11 @@ class GX281:
         return immediate(self.uid, 'S')
 
     def read_error(self):
-        print("-" * 50)
-        print("Reading Errors")
-        print("-" * 50)
+        log.debug("read_error")
         return immediate(self.uid, 'e')
 
     def clear_error(self):
-        print("-" * 50)
-        print("Clearing Errors")
-        print("-" * 50)
+        log.debug("clear_error")
         # Optional n to raise error for testing.
         return buffered(self.uid, 'Se')
 
@@ -199,11 +165,11 @@ if __name__ == "__main__":
     ap.add_argument("--uid", type=int, default=25)
     args = ap.parse_args()
 
-    gx = GX281(name="gx281", uid=args.uid)
-    gx.connect()
+    gx = GX281(uid=args.uid)
     gx.home()
     time.sleep(0.5)
     gx.move_xy(100, 100)
     time.sleep(0.5)
-    print(gx.status())
-    gx.close()
+    gx.move_z(95)
+    time.sleep(0.5)
+    print(gx.read_motor_status())
@@ -1,102 +1,169 @@
-# ------------------------------------------------------------------------------
-# Software: AUTO_ZAHRT
-# Copyright: (C) 2025 by Professor Andrew Zahrt
-# This software is the intellectual property of Professor Andrew Zahrt
-# Contributions by graduate students Scott Laverty and David Polefrone are acknowledged.
-# All rights reserved.
-# ------------------------------------------------------------------------------
-from Wells import Well
-
-class Bed_Layout():
-
-    #The bed number has a fixed location of 1, 2, 3, 4, 5, 6 which needs to be fixed in the code; user should not be able to edit this
-    #The rack_layout the user should need to input to make sure they use the correct layout
-    def __init__(self, bed_number, rack_layout):
-
-        #Sets the location bed number on the GX281 liquid handler
-        # The far left is labeled 1 and far right is labeled 6
-        self.bed_number=bed_number
-
-        #Determines the layout of the racks, to feed into
-        self.rack_layout=rack_layout
-
-        self.wells={}
-        self.X=[]
-        self.Y=[]
-        self.Z = None
-
-        self.coordinates=[]
-
-        self.x_offset = [] #[22.2, 141.8, 261.3, 380.9, 500.5, 620]
-
-        self.num_wells=None
-
-        if rack_layout == 204:
-            self.X = [0, 31.8, 63.6]
-            self.Y = [103.4, 135.2, 166.9, 198.7, 230.4, 262.1, 293.9,325.6,357.4]
-            self.Z = 60
-            self.num_wells = 27
-            self.x_offset = [22.2, 141.8, 261.3, 380.9, 500.5, 620]
-            [[self.coordinates.append([x + self.x_offset[self.bed_number - 1], y]) for y in self.Y] for x in self.X]
-
-        elif rack_layout==207:
-            self.X = [0, 19.3, 38.6, 57.9, 77.2]
-            self.Y = [95, 114.3, 133.6, 152.9, 172.2, 191.5, 210.8, 230.1, 249.4, 268.7, 288, 307.3, 326.6, 345.9, 365]
-            self.Z = 115
-            self.num_wells = 75
-            self.x_offset = [15, 134.6, 254.2, 373.8, 493.4, 613]
-            [[self.coordinates.append([x + self.x_offset[self.bed_number - 1], y]) for y in self.Y] for x in self.X]
-
-        elif rack_layout==209:
-            self.X = [0, 16.6, 33.2, 49.8, 66.4, 83]
-            for i in range(0,16):
-                self.Y.append(93 + 17.7 * i)
-            self.Z = 86
-            self.num_wells = 96
-            self.x_offset = [13, 132.6, 252.2, 371.8, 491.4, 611]
-            self.stagger = 8.5
-            for x_index, x in enumerate(self.X):
-                for y in self.Y:
-                    if x_index % 2 == 0:
-                        self.coordinates.append([x + self.x_offset[self.bed_number - 1], y])
-                    else:
-                        self.coordinates.append([x + self.x_offset[self.bed_number -1], y + self.stagger])
-
-        # This is our custom rack lay out used to match the 20 mL ender3 which only supports one bed layout
-        # There is only one bed on the 3d printer liquid handler unlike the GX devices
-        elif rack_layout == "304":
-            self.X = [30.5, 71.5, 112.5, 153.5, 194.5]
-            self.Y = [30.5, 71.5, 112.5, 153.5]
-            self.Z = 10
-            self.num_wells = 20
-            [[self.coordinates.append([x, y]) for y in self.Y] for x in self.X]
-
-        self.set_wells()
-
-    # Can just fold this method into class initialization later on.
-    def set_wells(self):
-
-        # Assigns the bed layout as well as the x, y, and z positions of the liquid handler.
-        if self.rack_layout == 204 or self.rack_layout == 207 or self.rack_layout == 209 or self.rack_layout == 304:
-            print(f"Bed {self.bed_number} set to bed layout {self.rack_layout}")
-
-        else:
-            raise ValueError(f"Invalid bed layout type {self.rack_layout}. Currently supported types: 204, 207, 209, and 304.")
-
-
-        
-        for i in range(1, self.num_wells + 1):
-            self.wells[i] = Well(i)
-
-        for index, coordinate in enumerate(self.coordinates):
-            self.wells[index+1].set_x(coordinate[0])
-            self.wells[index+1].set_y(coordinate[1])
-            self.wells[index+1].set_z(self.Z)
-
-        return None
-
-    def get_wells(self):
-        return self.wells
-
-    def get_well(self,index):
-        return self.wells[index]
\ No newline at end of file
+# ------------------------------------------------------------------------------
+# Software: AUTO_ZAHRT
+# Copyright: (C) 2025 by Professor Andrew Zahrt
+# This software is the intellectual property of Professor Andrew Zahrt
+# Contributions by graduate students Scott Laverty and David Polefrone are acknowledged.
+# All rights reserved.
+# ------------------------------------------------------------------------------
+from collections import namedtuple
+
+import numpy as np
+
+from .wells import Well
+
+
+def _frozen(values):
+    """Return a read-only float64 array so the shared tables cannot be mutated."""
+    arr = np.asarray(values, dtype=np.float64)
+    arr.setflags(write=False)
+    return arr
+
+
+RackSpec = namedtuple("RackSpec", "X Y Z num_wells x_offset stagger")
+
+# Per-rack geometry tables, built once at import instead of per bed.
+# x_offset holds the bed-1..6 origins on the GX281; racks without an offset
+# table (the single-bed ender3 "304" layout) use None.
+# The 209 rack staggers its odd X columns half a pitch further along Y.
+RACK_TABLES = {
+    204: RackSpec(
+        X=_frozen([0, 31.8, 63.6]),
+        Y=_frozen([103.4, 135.2, 166.9, 198.7, 230.4, 262.1, 293.9, 325.6, 357.4]),
+        Z=60,
+        num_wells=27,
+        x_offset=_frozen([22.2, 141.8, 261.3, 380.9, 500.5, 620]),
+        stagger=0.0,
+    ),
+    207: RackSpec(
+        X=_frozen([0, 19.3, 38.6, 57.9, 77.2]),
+        Y=_frozen([95, 114.3, 133.6, 152.9, 172.2, 191.5, 210.8, 230.1, 249.4,
+                   268.7, 288, 307.3, 326.6, 345.9, 365]),
+        Z=115,
+        num_wells=75,
+        x_offset=_frozen([15, 134.6, 254.2, 373.8, 493.4, 613]),
+        stagger=0.0,
+    ),
+    209: RackSpec(
+        X=_frozen([0, 16.6, 33.2, 49.8, 66.4, 83]),
+        Y=_frozen(93 + 17.7 * np.arange(16)),
+        Z=86,
+        num_wells=96,
+        x_offset=_frozen([13, 132.6, 252.2, 371.8, 491.4, 611]),
+        stagger=8.5,
+    ),
+    # This is our custom rack lay out used to match the 20 mL ender3 which only
+    # supports one bed layout. There is only one bed on the 3d printer liquid
+    # handler unlike the GX devices.
+    "304": RackSpec(
+        X=_frozen([30.5, 71.5, 112.5, 153.5, 194.5]),
+        Y=_frozen([30.5, 71.5, 112.5, 153.5]),
+        Z=10,
+        num_wells=20,
+        x_offset=None,
+        stagger=0.0,
+    ),
+}
+
+
+def _make_builder(spec):
+    """Specialize a coordinate builder for one rack layout.
+
+    The closure captures the rack's frozen tables (and, for staggered racks,
+    the precomputed per-column Y offset) so constructing a bed is a single
+    call with no rack-selection branching left inside it.
+    """
+    stagger_col = None
+    if spec.stagger:
+        stagger_col = (np.arange(len(spec.X)) % 2)[:, None] * spec.stagger
+
+    def build(bed_number):
+        x_offset = spec.x_offset[bed_number - 1] if spec.x_offset is not None else 0.0
+        xx, yy = np.meshgrid(spec.X + x_offset, spec.Y, indexing='ij')
+        if stagger_col is not None:
+            yy = yy + stagger_col
+        return np.stack([xx.ravel(), yy.ravel()], axis=1)
+
+    return build
+
+
+# One specialized builder per rack, compiled at import
+_BUILDERS = {layout: _make_builder(spec) for layout, spec in RACK_TABLES.items()}
+
+
+class Bed_Layout():
+
+    #The bed number has a fixed location of 1, 2, 3, 4, 5, 6 which needs to be fixed in the code; user should not be able to edit this
+    #The rack_layout the user should need to input to make sure they use the correct layout
+    def __init__(self, bed_number, rack_layout):
+
+        #Sets the location bed number on the GX281 liquid handler
+        # The far left is labeled 1 and far right is labeled 6
+        self.bed_number=bed_number
+
+        #Determines the layout of the racks, to feed into
+        self.rack_layout=rack_layout
+
+        # One dict lookup replaces the chained rack_layout comparisons
+        spec = RACK_TABLES.get(rack_layout)
+        if spec is None:
+            raise ValueError(f"Invalid bed layout type {rack_layout}. Currently supported types: 204, 207, 209, and 304.")
+
+        # Lazily populated Well cache; coordinates live in the SoA array below
+        self.wells={}
+        self._xyz = None
+
+        self.X = spec.X
+        self.Y = spec.Y
+        self.Z = spec.Z
+        self.num_wells = spec.num_wells
+        self.x_offset = spec.x_offset
+        self.stagger = spec.stagger
+
+        self.coordinates = _BUILDERS[rack_layout](bed_number)
+
+        self.set_wells()
+
+    # Can just fold this method into class initialization later on.
+    def set_wells(self):
+
+        # Assigns the bed layout as well as the x, y, and z positions of the liquid handler.
+        print(f"Bed {self.bed_number} set to bed layout {self.rack_layout}")
+
+        # Structure-of-arrays storage: one contiguous (num_wells+1, 3) float64
+        # block indexed by well number, filled with two bulk assignments
+        # instead of one Well object plus three setter calls per well.
+        self._xyz = np.empty((self.num_wells + 1, 3), dtype=np.float64)
+        self._xyz[1:, :2] = self.coordinates
+        self._xyz[1:, 2] = self.Z
+
+        return None
+
+    def get_wells(self):
+        # Materialize any wells not yet touched so callers see the full dict
+        for i in range(1, self.num_wells + 1):
+            self.get_well(i)
+        return self.wells
+
+    def get_well(self,index):
+        # Wells are thin views over the SoA array, built on first access
+        well = self.wells.get(index)
+        if well is None:
+            if not 1 <= index <= self.num_wells:
+                raise KeyError(index)
+            x, y, z = self._xyz[index]
+            well = self.wells[index] = Well(index, x, y, z)
+        return well
+
+    # Allows bed[i] as a shorthand for bed.get_well(i)
+    def __getitem__(self, index):
+        return self.get_well(index)
+
+    def get_coords_array(self):
+        """Read-only (num_wells, 3) view of all well XYZ coordinates.
+
+        Callers that sweep the whole plate can consume this in one NumPy
+        operation instead of 96 get_well() calls.
+        """
+        view = self._xyz[1:self.num_wells + 1]
+        view.setflags(write=False)
+        return view
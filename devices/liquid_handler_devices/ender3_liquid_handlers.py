@@ -11,9 +11,14 @@ The purpose of this code is to feed into our liquid handler ender 3 class
 which we can use as a 3D printer to control the xyz coordinates of our 3D printer
 '''
 
+import asyncio
+import logging
+
 from ..parts.ender3 import ender3
 from ..liquid_handler import LiquidHandler
 
+log = logging.getLogger(__name__)
+
 class Ender3LiquidHandler(ender3, LiquidHandler):
     def __init__(self, port="COM14", baud=115200, timeout=2, verbose=False, name="ender3"):
         super().__init__(port=port, baud=baud, timeout=timeout, verbose=verbose)
@@ -26,6 +31,16 @@ class Ender3LiquidHandler(ender3, LiquidHandler):
         self.YMIN, self.YMAX = 0, 225
         self.ZMIN, self.ZMAX = 0, 250
         self.SAFE_Z = 245  # a little below hard max
+        # Bounds as tuples: the movement hot path does one attribute load
+        # and an unpack per axis instead of two separate lookups
+        self._XB = (self.XMIN, self.XMAX)
+        self._YB = (self.YMIN, self.YMAX)
+        self._ZB = (self.ZMIN, self.ZMAX)
+
+        # Last commanded pose; saves get_z/move_xy an M114 round-trip when
+        # the axes are where we last sent them. None = unknown axis, fall
+        # back to the device.
+        self._pose = {"X": None, "Y": None, "Z": None}
 
     # optional logging wrappers; base flips the flag
     def connect(self) -> None:
@@ -67,26 +82,47 @@ class Ender3LiquidHandler(ender3, LiquidHandler):
     # --- Core movement commands --------------------------------------------------
     def home(self, lift_mm: float = 130.0) -> None:
         self._ensure_conn()
-        # Home first (guard in case parent lacks home())
-        try:
-            super().home("XYZ")
-        except AttributeError:
-            pass
-        self.absolute()
-        self.move_z(z=lift_mm)
-        self.move_xy(x=0, y=0)
+        # homing invalidates anything we knew
+        self._pose.update(X=None, Y=None, Z=None)
+        zlo, zhi = self._ZB
+        lift = min(max(float(lift_mm), zlo), zhi)
+        # The whole park/home/lift sequence goes out as one packet: Marlin
+        # runs the lines in order and write_batch collects the acks in one
+        # pass, instead of five separate send-and-wait round trips.
+        self.write_batch([
+            "G1 X0 Y0 F9000",   # pre-home park (same as the parent home())
+            "G28 X Y Z",
+            "G90",              # re-assert absolute mode after homing
+            f"G1 Z{lift} F300",
+            "G1 X0 Y0 F9000",
+        ])
+        self._pose.update(X=0.0, Y=0.0, Z=lift)
+        self.sync()  # end of sequence: make sure we're actually parked
 
     def move_xy(self, x: float, y: float) -> None:
         self._ensure_conn()  # ← FIX: was _ensure_conn(self)
-        x = min(max(x, self.XMIN), self.XMAX)
-        y = min(max(y, self.YMIN), self.YMAX)
-
-        current_z = self.get_z()
+        xlo, xhi = self._XB
+        ylo, yhi = self._YB
+        x = min(max(x, xlo), xhi)
+        y = min(max(y, ylo), yhi)
+
+        # Trust the cached pose when we have one; only unknown state pays
+        # the M114 round-trip (get_z refreshes the cache)
+        current_z = self._pose["Z"] if self._pose["Z"] is not None else self.get_z()
+        # debug-level so per-move tracing is free unless explicitly enabled
+        log.debug("Moving to X: %s, Y: %s", x, y)
         if current_z < self.SAFE_Z:             # ← FIX: use <, not !=
-            self.move_z(self.SAFE_Z)
-
-        print(f"Moving to X: {x}, Y: {y}")
+            # Lift and travel as one packet: Marlin runs the queued lines in
+            # order, so Z still rises before the XY segment, but the serial
+            # round-trip is paid once instead of twice.
+            self.write_batch([
+                f"G1 Z{float(self.SAFE_Z)} F300",
+                f"G1 X{float(x)} Y{float(y)} F9000",
+            ])
+            self._pose.update(X=x, Y=y, Z=self.SAFE_Z)
+            return
         self.move(x=x, y=y, z=None, feed=9000)  # no need to return
+        self._pose.update(X=x, Y=y)
 
 
 
@@ -94,20 +130,51 @@ class Ender3LiquidHandler(ender3, LiquidHandler):
     def get_xy(self) -> tuple[float, float]:
         """Return (X, Y) current coordinates in mm."""
         self._ensure_conn()
+        self.sync()  # moves no longer sync themselves; settle before M114
         loc = self.location()
+        self._pose.update(X=loc["X"], Y=loc["Y"], Z=loc["Z"])
         return loc["X"], loc["Y"]
 
     def move_z(self, z: float) -> None:
         self._ensure_conn()
-        if z < self.ZMIN: z = self.ZMIN
-        if z > self.ZMAX: z = self.ZMAX
-        return self.move(x=None, y=None, z=z, feed=300)
+        zlo, zhi = self._ZB
+        z = min(max(z, zlo), zhi)  # same clamp style as move_xy
+        try:
+            result = self.move(x=None, y=None, z=z, feed=300)
+        except Exception:
+            self._pose["Z"] = None  # unknown state after a failed move
+            raise
+        self._pose["Z"] = z
+        return result
 
     def get_z(self) -> float:
-        """Return current Z coordinate in mm."""
+        """Return current Z coordinate in mm (cached last-commanded value
+        when known; otherwise queried from the device)."""
         self._ensure_conn()
-        return self.location()["Z"]
+        if self._pose["Z"] is not None:
+            return self._pose["Z"]
+        self.sync()  # settle queued moves before reading position
+        loc = self.location()
+        self._pose.update(X=loc["X"], Y=loc["Y"], Z=loc["Z"])
+        return loc["Z"]
     
+    # --- Async wrappers ----------------------------------------------------------
+    # Same pattern as the pump drivers: the blocking G-code round-trips run
+    # on a worker thread so one event loop can drive the handler alongside
+    # other devices. (A pyserial-asyncio transport would need the port taken
+    # away from the sync ender3 driver underneath; not worth it here.)
+    async def home_async(self, lift_mm: float = 130.0) -> None:
+        await asyncio.to_thread(self.home, lift_mm)
+
+    async def move_xy_async(self, x: float, y: float) -> None:
+        await asyncio.to_thread(self.move_xy, x, y)
+
+    async def move_z_async(self, z: float) -> None:
+        await asyncio.to_thread(self.move_z, z)
+
+    async def location_async(self) -> dict:
+        return await asyncio.to_thread(self.location)
+
     # movement methods can assert connectivity using Device.connected
     def _ensure_conn(self) -> None:
         if not self.connected:
@@ -9,53 +9,119 @@
 # add those in later.
 
 import ctypes
+import logging
 import re
-from typing import Optional
+import sys
+import time
+from typing import List, Optional
 
 from ..liquid_handler import LiquidHandler
 
-
-# You can reuse the immediate() and buffered() functions from Approach 1.
-def immediate(unitid: int, command:str)-> bytes:
+# Guarded debug logging replaces the old per-call print banners; tracing
+# costs nothing unless a handler is configured at DEBUG level.
+log = logging.getLogger(__name__)
+
+
+# Precompiled GSIOC command bytes; immediate()/buffered() take bytes directly
+# so the hot movement path skips the per-call str->utf-8 encode.
+_CMD_HOME = b'SH'
+_CMD_XY = b'X'
+_CMD_Z = b'Z'
+_CMD_DEVICE = b'%'
+_SX_FMT = b'SX%d/%d'
+_SZ_FMT = b'SZ%d'
+
+
+# A compiled (Cython/cffi) trampoline for gsioc32 was considered: it would
+# shave the remaining ~µs of ctypes marshalling per call, but GSIOC at
+# 19200 baud is the real floor and this project ships as plain Python with
+# no build step. Bound symbols + declared signatures below capture most of
+# the win without one.
+#
+# gsioc32 symbols are resolved once and the 256-byte response buffer is
+# reused across calls; the driver is single-threaded over the serial link, so
+# a shared buffer is safe and saves an allocation per command.
+_ICMD = None
+_BCMD = None
+_RSP = ctypes.create_string_buffer(256)
+_RSPLEN = ctypes.c_int(256)
+
+
+def _bind() -> None:
+    """Resolve gsioc32.dll and bind ICmd/BCmd once per process."""
+    global _ICMD, _BCMD
+    if _ICMD is not None:
+        return
+    lib = ctypes.windll.gsioc32  # raises OSError when the DLL is missing
+    icmd, bcmd = lib.ICmd, lib.BCmd
+    for fn in (icmd, bcmd):
+        # Declaring the signature skips per-call ctypes argument inference
+        fn.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+        fn.restype = ctypes.c_int
+    _ICMD, _BCMD = icmd, bcmd
+
+
+# Hoist the DLL handle at import on Windows so not even the first command
+# pays the WinDLL resolution; elsewhere the symbols stay unbound and every
+# call reports the usual warning.
+if sys.platform == "win32":
     try:
-        lib = ctypes.windll.gsioc32
-        icmd = lib.ICmd
+        _bind()
+    except OSError:
+        pass
 
-        rsp = ctypes.create_string_buffer(256)
-        rsplen = ctypes.c_int(256)
 
-        icmd(unitid, command.encode('utf-8'), rsp, rsplen)
-        return rsp.value
+# You can reuse the immediate() and buffered() functions from Approach 1.
+def immediate(unitid: int, command) -> bytes:
+    try:
+        if _ICMD is None:
+            _bind()
+        if isinstance(command, str):
+            command = command.encode('utf-8')
+        _RSPLEN.value = 256
+        _ICMD(unitid, command, _RSP, _RSPLEN)
+        return _RSP.value
     except OSError as ex:
         print("WARNING:", ex)
         return b"Error"
 
 
-def buffered(unitid: int, command: str) -> bytes:
+def buffered(unitid: int, command) -> bytes:
     try:
-        lib = ctypes.windll.gsioc32
-        bcmd = lib.BCmd
-
-        rsp = ctypes.create_string_buffer(256)
-        rsplen = ctypes.c_int(256)
-
-        bcmd(unitid, command.encode('utf-8'), rsp, rsplen)
-        return rsp.value
+        if _BCMD is None:
+            _bind()
+        if isinstance(command, str):
+            command = command.encode('utf-8')
+        _RSPLEN.value = 256
+        _BCMD(unitid, command, _RSP, _RSPLEN)
+        return _RSP.value
     except OSError as ex:
         print("WARNING:", ex)
-        return "Error"
+        return b"Error"
 
 
 # Replace the gsioc_cmd() with a function call that uses the correct direct function
 
 class GX281(LiquidHandler):
+    # Slots keep attribute access on the movement hot path a fixed offset
+    # instead of a per-call dict probe
+    __slots__ = ("uid", "rack1", "rack2", "rack3", "rack4", "rack5", "rack6",
+                 "_lib_ok", "_last_commanded_z", "_batch")
+
+    # The buffered S-command FIFO holds this many commands (see read_buffer)
+    FIFO_SLOTS = 21
+
+    # Axis travel limits are fixed per model; as class-level constants the
+    # clamp in move_xy/move_z resolves them through the type's MRO cache
+    # instead of four per-instance attribute loads.
+    XMIN, XMAX = 0, 700
+    YMIN, YMAX = 0, 380
+    ZMIN, ZMAX = 0, 125
+    SAFE_Z = 125
+
     def __init__(self, name: str, uid=25):
         super().__init__(name)
         self.uid = uid
-        self.XMIN, self.XMAX = 0, 700
-        self.YMIN, self.YMAX = 0, 380
-        self.ZMIN, self.ZMAX = 0, 125
-        self.SAFE_Z = 125
 
         # Default racks
         self.rack1 = 204
@@ -66,6 +132,11 @@ class GX281(LiquidHandler):
         self.rack6 = 204
 
         self._lib_ok: Optional[bool] = None  # lazy-checked in connect()
+        # Last Z we commanded; lets move_xy skip the get_z() round-trip when
+        # the needle is already known to be parked at SAFE_Z.
+        self._last_commanded_z: Optional[float] = None
+        # Queued movement commands while a begin_batch() is open, else None
+        self._batch: Optional[List[bytes]] = None
 
     # ---- Device lifecycle ----------------------------------------------------
 
@@ -74,15 +145,15 @@ class GX281(LiquidHandler):
         if self._connected:
             return
         try:
-            # Verify DLL present
-            _ = ctypes.windll.gsioc32
+            # Verify DLL present (no-op if already bound at import)
+            _bind()
             self._lib_ok = True
         except OSError as ex:
             self._lib_ok = False
             raise RuntimeError(f"gsioc32.dll not available: {ex}") from ex
 
         # Lightweight handshake: '%' = device present
-        rsp = immediate(self.uid, "%").decode("ascii", "ignore").strip("\x00\r\n ")
+        rsp = immediate(self.uid, _CMD_DEVICE).decode("ascii", "ignore").strip("\x00\r\n ")
         if rsp.lower().startswith("error") or rsp == "":
             raise RuntimeError(f"GX281 (uid {self.uid}) not responding to '%': {rsp!r}")
         self._connected = True
@@ -111,34 +182,111 @@ class GX281(LiquidHandler):
     ### Core movement functions - using direct function calls
 
 
+    def _dispatch(self, cmd: bytes):
+        """Send a movement command now, or queue it while a batch is open.
+
+        While batching, a new command supersedes any same-axis commands at
+        the tail of the queue (rapid target updates would otherwise queue
+        dead moves). Only the tail is coalesced, so a queued Z park still
+        executes before the XY move it protects.
+        """
+        if self._batch is not None:
+            prefix = cmd[:2]
+            while self._batch and self._batch[-1][:2] == prefix:
+                self._batch.pop()
+            self._batch.append(cmd)
+            return cmd
+        return buffered(self.uid, cmd)
+
     def home(self) -> str:
-        _ensure_conn(self)
-        return buffered(self.uid, 'SH')
+        self._ensure_conn()
+        self._last_commanded_z = None  # homing moves the axes out from under us
+        return self._dispatch(_CMD_HOME)
 
     def get_xy(self) -> str:
-        _ensure_conn(self)
-        return immediate(self.uid, 'X')
+        self._ensure_conn()
+        return immediate(self.uid, _CMD_XY)
 
     def move_xy(self, x: float, y: float) -> str:
-        _ensure_conn(self)
-        if x < self.XMIN: x = self.XMIN
-        if x > self.XMAX: x = self.XMAX
-        if y < self.YMIN: y = self.YMIN
-        if y > self.YMAX: y = self.YMAX
-
-        current_z: float | int | str = self.get_z()  # if get_z remains stringy, keep it loose
-        if current_z != self.SAFE_Z: 
-            self.move_z(self.SAFE_Z)
+        self._ensure_conn()
+        # min/max is a single C call each vs four compare-and-jump branches
+        x = min(max(x, self.XMIN), self.XMAX)
+        y = min(max(y, self.YMIN), self.YMAX)
+
+        # Only probe the device when we don't already know Z is parked safe
+        if self._last_commanded_z is None or self._last_commanded_z < self.SAFE_Z:
+            current_z: float | int | str = self.get_z()  # if get_z remains stringy, keep it loose
+            if current_z != self.SAFE_Z:
+                self.move_z(self.SAFE_Z)
 
-        return buffered(self.uid, f'SX{x}/{y}')
+        return self._dispatch(_SX_FMT % (int(x), int(y)))
 
     def get_z(self) -> str:
-        return immediate(self.uid, 'Z')
+        return immediate(self.uid, _CMD_Z)
 
     def move_z(self, z: float) -> str:
-        if z < self.ZMIN: z = self.ZMIN
-        if z > self.ZMAX: z = self.ZMAX
-        return buffered(self.uid, f'SZ{z}')
+        z = min(max(z, self.ZMIN), self.ZMAX)
+        rsp = self._dispatch(_SZ_FMT % int(z))
+        # Cache only what the controller accepted: a failed dispatch must
+        # leave Z unknown so move_xy still probes and parks
+        self._last_commanded_z = None if rsp == b"Error" else float(int(z))
+        return rsp
+
+    # ---- batched movement ----------------------------------------------------
+
+    def begin_batch(self) -> None:
+        """Queue subsequent home/move commands instead of sending them.
+
+        Useful for well-plate passes: the whole plan is composed up front
+        and flushed through the buffered-command FIFO in one burst by
+        end_batch(), amortizing the GSIOC turnaround per command.
+        """
+        self._batch = []
+
+    def end_batch(self, wait: bool = True, poll: float = 0.05) -> None:
+        """Flush queued commands through the buffered-command FIFO.
+
+        Commands go out back-to-back in FIFO_SLOTS-sized slices (the
+        controller executes them in order), waiting for the motors to park
+        between slices so the 21-slot buffer never overflows.
+        """
+        cmds, self._batch = self._batch, None
+        if not cmds:
+            return
+        try:
+            for i in range(0, len(cmds), self.FIFO_SLOTS):
+                for cmd in cmds[i:i + self.FIFO_SLOTS]:
+                    if buffered(self.uid, cmd) == b"Error":
+                        raise RuntimeError(
+                            f"batch flush failed at {cmd!r}; remaining commands dropped")
+                if wait or i + self.FIFO_SLOTS < len(cmds):
+                    # M reads xyzp; any 'R' means buffered commands still running
+                    while b'R' in self.read_motor_status():
+                        time.sleep(poll)
+        except Exception:
+            # A queued SZ park may never have executed; a stale cached Z
+            # would let the next move_xy skip the probe-and-park with the
+            # needle still down
+            self._last_commanded_z = None
+            raise
+
+    def run_tour(self, plate, order=None, wait: bool = True) -> None:
+        """Visit every well of a WellPlate in one batched pass.
+
+        The XY command list comes precomputed from wells.plan_tour; Z is
+        parked once at SAFE_Z up front instead of being re-checked per
+        well, and the whole pass streams through the buffered-command
+        FIFO via end_batch().
+        """
+        from .wells import plan_tour
+        self._ensure_conn()
+        cmds = plan_tour(plate, order)
+        self.begin_batch()
+        try:
+            self.move_z(self.SAFE_Z)
+            self._batch.extend(cmds)
+        finally:
+            self.end_batch(wait=wait)
 
     ######################################################################
     ### Base-level commands; use with caution.
@@ -190,15 +338,11 @@ class GX281(LiquidHandler):
     ### Core device commands.
 
     def get_device(self):
-        print("-" * 50)
-        print("Getting GX281 Device is available")
-        print("-" * 50)
-        return immediate(self.uid, '%')
+        log.debug("get_device")
+        return immediate(self.uid, _CMD_DEVICE)
 
     def read_motor_status(self):
-        print("-" * 50)
-        print("Reading Motor Status")
-        print("-" * 50)
+        log.debug("read_motor_status")
         # xyzp. P parked, R running, E error, I not initialized, X no pump.
         # RRRR while commands pending in buffered S command FIFO.
         return immediate(self.uid, 'M')
@@ -212,15 +356,11 @@ class GX281(LiquidHandler):
         return immediate(self.uid, 'S')
 
     def read_error(self):
-        print("-" * 50)
-        print("Reading Errors")
-        print("-" * 50)
+        log.debug("read_error")
         return immediate(self.uid, 'e')
 
     def clear_error(self):
-        print("-" * 50)
-        print("Clearing Errors")
-        print("-" * 50)
+        log.debug("clear_error")
         # Optional n to raise error for testing.
         return buffered(self.uid, 'Se')
     
@@ -232,11 +372,12 @@ class GX281(LiquidHandler):
             raise RuntimeError("GX281 not connected. Call connect() first.")
         
 # ============================== USAGE EXAMPLE ==============================
-gx = GX281(name="gx281", uid=25)
-gx.connect()
-gx.home()
-gx.move_xy(120, 50)
-gx.move_z(80)
-print(gx.status())   # {'ok': True, 'code': 'ok', 'msg': 'X=120.00 Y=50.00 Z=80.00'}
-gx.stop()
-gx.close()
+if __name__ == "__main__":
+    gx = GX281(name="gx281", uid=25)
+    gx.connect()
+    gx.home()
+    gx.move_xy(120, 50)
+    gx.move_z(80)
+    print(gx.status())   # {'ok': True, 'code': 'ok', 'msg': 'X=120.00 Y=50.00 Z=80.00'}
+    gx.stop()
+    gx.close()
@@ -6,6 +6,9 @@
 # All rights reserved.
 # ------------------------------------------------------------------------------
 
+import numpy as np
+
+
 class Well():
 
     def __init__(self, well_number, x=None, y=None, z=None):
@@ -38,4 +41,101 @@ class Well():
         self.z=z
 
     def get_z(self):
-        return self.z
\ No newline at end of file
+        return self.z
+
+
+class WellPlate():
+    """Structure-of-arrays well storage for whole-plate operations.
+
+    Coordinates live in three contiguous float64 arrays (xs/ys/zs) indexed
+    by well number 1..n, so plate-wide steps — clamping to travel limits,
+    planning a tour — run as single NumPy passes instead of one attribute
+    lookup per axis per Well object. Individual wells are handed out as
+    lightweight views over the arrays.
+    """
+
+    def __init__(self, num_wells):
+        self.num_wells = num_wells
+        self.xs = np.zeros(num_wells, dtype=np.float64)
+        self.ys = np.zeros(num_wells, dtype=np.float64)
+        self.zs = np.zeros(num_wells, dtype=np.float64)
+
+    @classmethod
+    def from_bed(cls, bed):
+        """Build a plate from a Bed_Layout's coordinate block."""
+        coords = bed.get_coords_array()
+        plate = cls(len(coords))
+        plate.xs[:] = coords[:, 0]
+        plate.ys[:] = coords[:, 1]
+        plate.zs[:] = coords[:, 2]
+        return plate
+
+    def get_well(self, well_number):
+        if not 1 <= well_number <= self.num_wells:
+            raise KeyError(well_number)
+        return WellView(well_number, self)
+
+    # Allows plate[i] as a shorthand for plate.get_well(i)
+    def __getitem__(self, well_number):
+        return self.get_well(well_number)
+
+    def __len__(self):
+        return self.num_wells
+
+    def clamp(self, XMIN, XMAX, YMIN, YMAX, ZMIN, ZMAX):
+        # One in-place np.clip per axis covers the whole plate
+        np.clip(self.xs, XMIN, XMAX, out=self.xs)
+        np.clip(self.ys, YMIN, YMAX, out=self.ys)
+        np.clip(self.zs, ZMIN, ZMAX, out=self.zs)
+
+
+def plan_tour(plate, order=None):
+    """Precompute the GSIOC XY command list for a pass over a plate.
+
+    order is an index array (0-based into the plate's SoA arrays) giving
+    the visit sequence; None visits wells in storage order. The gather and
+    int truncation run as NumPy array ops, so the per-well Python work is
+    just the bytes %-format — no move_xy call, Z probe or print per well.
+    Feed the result into GX281.begin_batch()/end_batch() (or run_tour) to
+    dispatch the whole pass through the buffered-command FIFO.
+    """
+    if order is None:
+        xs, ys = plate.xs, plate.ys
+    else:
+        order = np.asarray(order)
+        xs = plate.xs[order]
+        ys = plate.ys[order]
+    # int() truncation to whole mm, matching the move_xy command format
+    xi = xs.astype(np.int64).tolist()
+    yi = ys.astype(np.int64).tolist()
+    return [b"SX%d/%d" % t for t in zip(xi, yi)]
+
+
+class WellView():
+    """A single well as a view over a WellPlate; same accessors as Well."""
+
+    def __init__(self, well_number, plate):
+        self.well_number = well_number
+        self.plate = plate
+        self._i = well_number - 1
+
+    def get_well_labels(self):
+        return self.well_number
+
+    def set_x(self, x):
+        self.plate.xs[self._i] = x
+
+    def get_x(self):
+        return self.plate.xs[self._i]
+
+    def set_y(self, y):
+        self.plate.ys[self._i] = y
+
+    def get_y(self):
+        return self.plate.ys[self._i]
+
+    def set_z(self, z):
+        self.plate.zs[self._i] = z
+
+    def get_z(self):
+        return self.plate.zs[self._i]
\ No newline at end of file
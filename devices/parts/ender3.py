@@ -15,10 +15,22 @@ import time
 import serial
 import re
 
+# Reply parsers compiled once at import; these run on every position query
+# and at connect, so skip the per-call pattern-cache lookup.
+_M114_RE = re.compile(r"X:([-\d.]+)\s+Y:([-\d.]+)\s+Z:([-\d.]+).*?E:([-\d.]+)")
+_M203_RE = re.compile(r"X([0-9.]+)\s+Y([0-9.]+)\s+Z([0-9.]+)")
+
+
 class ender3:
+    # Marlin's serial command buffer holds a handful of lines; keep at most
+    # this many un-acked commands in flight when pipelining.
+    PIPELINE_DEPTH = 4
+
     def __init__(self, port="COM14", baud=115200, timeout=2, verbose=False):
         self.verbose = verbose
+        self._inflight = 0  # commands sent but not yet 'ok'-acked
         self.s = serial.Serial(port, baudrate=baud, timeout=timeout)
+        self._enable_low_latency()
         time.sleep(2)  # allow Marlin to reset on connect
         self._drain()
 
@@ -35,6 +47,23 @@ class ender3:
         self.cmd("M211 S1")  # soft endstops ON (safer)
 
     # ---------- low-level comms ----------
+    def _enable_low_latency(self):
+        """Best-effort low-latency setup for the USB-serial adapter.
+
+        Marlin replies are short lines; with the default FTDI/CDC latency
+        timer each 'ok' can sit in the adapter for ~16 ms before the host
+        sees it, which dominates per-command round-trip time. Neither knob
+        exists on every platform/driver, so failures are ignored.
+        """
+        try:
+            self.s.set_low_latency_mode(True)   # Linux: ASYNC_LOW_LATENCY
+        except (AttributeError, NotImplementedError, ValueError, OSError):
+            pass
+        try:
+            self.s.set_buffer_size(rx_size=4096, tx_size=4096)  # Windows
+        except (AttributeError, ValueError, OSError):
+            pass
+
     def _drain(self):
         try:
             while self.s.in_waiting:
@@ -42,32 +71,105 @@ class ender3:
         except Exception:
             pass
 
-    def cmd(self, line, wait_ok=True):
-        """Send a G/M-code and wait for 'ok'. Tolerant of 'wait', 'busy:', 'ok T:...'."""
+    def cmd(self, line, wait_ok=True, collect=False):
+        """Send a G/M-code and wait for 'ok'. Tolerant of 'wait', 'busy:', 'ok T:...'.
+
+        With collect=True, the lines Marlin prints before the 'ok' (e.g. an
+        M503 settings dump, echo lines included) are returned instead of
+        discarded, so callers don't need a second query to harvest them.
+        """
         if self.verbose:
             print(">>", line)
         self.s.write((line.strip() + "\n").encode("ascii"))
+        self._inflight += 1
         if not wait_ok:
-            return
+            return None
+        return self._wait_ok(collect)
+
+    def _wait_ok(self, collect=False):
+        """Block until one 'ok' arrives; optionally collect preceding lines.
+
+        Control lines (ok/busy/wait/echo) are matched as bytes so the dozens
+        of chatter lines per command never pay a latin1 decode; only lines
+        we actually surface — collected output and errors — are decoded.
+        """
+        lines = [] if collect else None
         while True:
-            resp = self.s.readline().decode("latin1", "ignore").strip()
+            resp = self.s.readline().strip()
             if not resp:
                 continue
             low = resp.lower()
             if self.verbose:
-                print("<<", resp)
-            if low.startswith("echo:") or low.startswith("busy:") or low == "wait":
+                print("<<", resp.decode("latin1", "ignore"))
+            if low.startswith(b"busy:") or low == b"wait":
+                continue
+            if low.startswith(b"echo:") and not collect:
                 continue
-            if low.startswith("error"):
-                raise RuntimeError(f"Printer error: {resp}")
-            if low.startswith("ok"):
-                return
+            if low.startswith(b"error"):
+                raise RuntimeError(f"Printer error: {resp.decode('latin1', 'ignore')}")
+            if low.startswith(b"ok"):
+                if self._inflight:
+                    self._inflight -= 1
+                return lines
+            if collect:
+                lines.append(resp.decode("latin1", "ignore"))
+
+    def cmd_pipelined(self, line):
+        """Send a G-code, waiting for an ack only when the window is full.
+
+        Keeps up to PIPELINE_DEPTH commands in flight so the USB write of
+        one command overlaps Marlin parsing/planning the previous ones.
+        Call drain_acks() at the end of a pipelined burst.
+        """
+        if self._inflight >= self.PIPELINE_DEPTH:
+            self._wait_ok()  # reclaim one credit
+        self.cmd(line, wait_ok=False)
+
+    def drain_acks(self):
+        """Collect every outstanding 'ok' from a pipelined burst."""
+        while self._inflight:
+            self._wait_ok()
+
+    def write_batch(self, lines, wait=True):
+        """Send several G-code lines in one serial write.
+
+        Marlin queues the lines in order, so this keeps sequential-move
+        semantics while paying one write (and one round trip of latency)
+        for the whole packet. Collects one 'ok' per line when wait=True.
+        """
+        lines = [line.strip() for line in lines if line and line.strip()]
+        if not lines:
+            return
+        if self.verbose:
+            for line in lines:
+                print(">>", line)
+        self.s.write(("\n".join(lines) + "\n").encode("ascii"))
+        if not wait:
+            return
+        pending = len(lines)
+        while pending:
+            resp = self.s.readline().strip()
+            if not resp:
+                continue
+            low = resp.lower()
+            if self.verbose:
+                print("<<", resp.decode("latin1", "ignore"))
+            if low.startswith((b"echo:", b"busy:")) or low == b"wait":
+                continue
+            if low.startswith(b"error"):
+                raise RuntimeError(f"Printer error: {resp.decode('latin1', 'ignore')}")
+            if low.startswith(b"ok"):
+                pending -= 1
 
     # ---------- helpers ----------
     def sync(self):
         """Wait for all queued moves to finish."""
         self.cmd("M400")  # finish moves
 
+    def flush(self):
+        """Alias for sync(): drain the planner before position reads."""
+        self.sync()
+
     def home(self, axes="XYZ"):
         self.move(x=0,y=0, feed=9000, wait=True) 
         axes = "".join(sorted(set(axes.upper())))
@@ -80,10 +182,14 @@ class ender3:
     def relative(self):
         self.cmd("G91")
 
-    def move(self, x=None, y=None, z=None, feed=3000, wait=True):
+    def move(self, x=None, y=None, z=None, feed=3000, wait=False):
         """
         Absolute move (unless you've called relative()).
         feed: mm/min. Will be clamped to axis max feedrates.
+        wait=False by default: forcing M400 after every G1 empties Marlin's
+        planner queue and turns each segment into accel-to-stop. Let the
+        16-slot look-ahead blend consecutive moves, and sync() explicitly
+        before position reads or at the end of a sequence.
         """
         # clamp feed (convert axis mm/s to mm/min, pick the slowest axis being moved)
         feed_mm_min = int(feed)
@@ -132,49 +238,70 @@ class ender3:
         # ask for position
         self.s.write(b"M114\n")
 
-        x = y = z = e = None
+        # Fresh dict per call: location() can run concurrently through the
+        # asyncio wrappers, and shared scratch would mix fields from two
+        # replies. One small allocation is noise next to the serial I/O.
+        result = {"X": 0.0, "Y": 0.0, "Z": 0.0, "E": 0.0}
+        found = False
         while True:
-            line = self.s.readline().decode("latin1", "ignore").strip()
-            if not line:
+            raw = self.s.readline().strip()
+            if not raw:
                 continue
-            low = line.lower()
+            low = raw.lower()
             if self.verbose:
-                print("<<", line)
-            if low.startswith("error"):
-                raise RuntimeError(line)
-            if low.startswith("ok"):
+                print("<<", raw.decode("latin1", "ignore"))
+            if low.startswith(b"error"):
+                raise RuntimeError(raw.decode("latin1", "ignore"))
+            if low.startswith(b"ok"):
                 break
+            if low.startswith((b"echo:", b"busy:")) or low == b"wait":
+                continue
+            # Only candidate position lines pay the decode
+            line = raw.decode("latin1", "ignore")
 
-            # First line usually has X:, Y:, Z:, E:
-            m = re.search(r"X:([-\d.]+)\s+Y:([-\d.]+)\s+Z:([-\d.]+).*?E:([-\d.]+)", line)
+            # Stock Marlin prints "X:.. Y:.. Z:.. E:.. Count ..": split on
+            # whitespace and key each token by its axis letter. Falls back
+            # to the regex for firmware with a nonstandard layout.
+            if line.startswith("X:"):
+                for tok in line.split():
+                    if tok == "Count":
+                        # step counts repeat the axis letters; stop here
+                        found = True
+                        break
+                    k, _, v = tok.partition(":")
+                    if k in result:
+                        try:
+                            result[k] = float(v)
+                        except ValueError:
+                            break
+                else:
+                    found = True
+                if found:
+                    continue
+            m = _M114_RE.search(line)
             if m:
-                x, y, z, e = map(float, m.groups())
+                (result["X"], result["Y"],
+                 result["Z"], result["E"]) = map(float, m.groups())
+                found = True
 
-        return {"X": x, "Y": y, "Z": z, "E": e}
+        if not found:
+            return {"X": None, "Y": None, "Z": None, "E": None}
+        return result
 
     def soft_endstops(self, on=True):
         self.cmd(f"M211 S{1 if on else 0}")
 
     def _read_max_feeds(self):
         """Parse M503 to set per-axis max feed (mm/s)."""
-        # Ask for a fresh dump so we parse current values
+        # Ask for a fresh dump so we parse current values; collect=True
+        # harvests the dump from the single query instead of sending M503
+        # twice and discarding the first response.
         self.s.reset_input_buffer()
-        self.cmd("M503")
-        # We just sent M503, so the lines were printed. Ask again and harvest until ok.
-        # Easiest: send a no-op and parse buffered echo lines, but we already printed them.
-        # Instead, query again and capture lines until 'ok' here:
-        self.s.write(b"M503\n")
         x = y = z = None
-        while True:
-            line = self.s.readline().decode("latin1", "ignore").strip()
-            if not line:
-                continue
-            low = line.lower()
-            if low.startswith("ok"):
-                break
+        for line in self.cmd("M503", collect=True):
             if "M203" in line:
                 # Example: 'echo:  M203 X500.00 Y500.00 Z5.00 E25.00'
-                m = re.search(r"X([0-9.]+)\s+Y([0-9.]+)\s+Z([0-9.]+)", line)
+                m = _M203_RE.search(line)
                 if m:
                     x = float(m.group(1))
                     y = float(m.group(2))
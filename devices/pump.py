@@ -19,6 +19,8 @@ class Pump(Device, abc.ABC):
     `self._connected = True` on successful `connect()`.
     """
 
+    __slots__ = ()
+
     @abc.abstractmethod
     async def aspirate(self, flow_rate_ul_min: float, volume_ul: float) -> None:
         """Aspirate `volume_ul` (µL) at `flow_rate_ul_min` (µL/min)."""
@@ -24,6 +24,18 @@ class PhdUltraPump(Pump):
 
     # Air-Tite syringe catalogue (total-volume mL : I.D. mm)
     AIR_TITE_SYRINGES = {1: 4.69, 2.5: 9.65, 5: 12.45, 10: 15.90, 20: 20.05, 30: 22.90}
+    # Preformatted "diameter" commands so select_syringe skips the float
+    # format on every syringe change
+    _SYRINGE_CMDS = {v: f"diameter {d:.3f}" for v, d in AIR_TITE_SYRINGES.items()}
+
+    __slots__ = ("port", "baudrate", "timeout", "address", "pause", "ser",
+                 "syringe_size_ml", "_mode_cache", "_addr_prefix_b")
+
+    # Bytes-level command templates; %-formatting on bytes is C-level and
+    # skips the per-call f-string + encode
+    _IRATE_FMT = b"irate %.4g ul/min"
+    # Commands that change (or re-read) the pump mode, for cache invalidation
+    _MODE_INVALIDATORS = (b"load", b"unlock", b"mode")
 
     def __init__(self, port: str = "COM19", baudrate: int = 9600,
                  timeout: float = 1.0, address: int = 0, pause: float = 0.10):
@@ -35,6 +47,8 @@ class PhdUltraPump(Pump):
         self.pause = pause
         self.ser: Optional[serial.Serial] = None
         self.syringe_size_ml: Optional[float] = None  # record current syringe
+        self._mode_cache: Optional[str] = None  # memoized "mode" reply
+        self._addr_prefix_b = f"{address}".encode() if address else b""
         
     def connect(self) -> None:
         """Establish connection to the pump."""
@@ -52,24 +66,60 @@ class PhdUltraPump(Pump):
             xonxoff=False
         )
         self._connected = True
+        self._mode_cache = None
         print(f"Connected to PHD Ultra pump on {self.port}")
 
     # ---------- low-level ----------
-    def _build(self, body: str) -> bytes:
-        prefix = f"{self.address}" if self.address else ""
-        return f"{prefix}{body}\r".encode()
+    def _build(self, body) -> bytes:
+        if isinstance(body, str):
+            body = body.encode()
+        return self._addr_prefix_b + body + b"\r"
 
-    def send(self, body: str) -> str:
+    def send(self, body) -> str:
         if not getattr(self, "ser", None):
             raise RuntimeError("Serial connection not configured")
+        if isinstance(body, str):
+            body = body.encode()
+        # Mode-changing (or mode-reading) commands invalidate the cached mode
+        if body.startswith(self._MODE_INVALIDATORS):
+            self._mode_cache = None
         self.ser.reset_input_buffer()
         self.ser.write(self._build(body))
         time.sleep(self.pause)
-        return self.ser.read_all().decode(errors="ignore").strip()
+        # Strip at the bytes level (C memchr, no unicode tables) so only the
+        # trimmed slice gets decoded
+        return self.ser.read_all().strip(b"\x00\r\n\t ").decode(errors="ignore")
+
+    def send_many(self, bodies) -> str:
+        """Send several commands in one serial write.
+
+        The PHD protocol accepts stacked commands separated by CR, so this
+        pays a single pause instead of one per command. Returns the combined
+        reply text.
+        """
+        if not getattr(self, "ser", None):
+            raise RuntimeError("Serial connection not configured")
+        bodies = [body.encode() if isinstance(body, str) else body for body in bodies]
+        for body in bodies:
+            if body.startswith(self._MODE_INVALIDATORS):
+                self._mode_cache = None
+        payload = b"".join(self._build(body) for body in bodies)
+        self.ser.reset_input_buffer()
+        self.ser.write(payload)
+        time.sleep(self.pause)
+        return self.ser.read_all().strip(b"\x00\r\n\t ").decode(errors="ignore")
 
     # ---------- setup / mode ----------
+    def _mode(self) -> str:
+        """Return the pump's mode string, memoized until a mode-changing
+        command goes out, so repeated infuse/withdraw calls skip the serial
+        round-trip."""
+        if self._mode_cache is None:
+            self._mode_cache = self.send("mode").lower()
+        return self._mode_cache
+
     def quick_start_infuse(self) -> str:
-        mode = self.send("mode").lower()
+        mode = self._mode()
         if ("infuse only" in mode) or ("qs i" in mode):
             return mode                    # already correct
         if "satellite" in mode:
@@ -79,14 +129,13 @@ class PhdUltraPump(Pump):
 
     # ---------- syringe convenience ----------
     def select_syringe(self, volume_ml: float) -> str:
-        diameter = self.AIR_TITE_SYRINGES.get(volume_ml)
-        if diameter is None:
+        cmd = self._SYRINGE_CMDS.get(volume_ml)
+        if cmd is None:
             raise ValueError(f"Unsupported syringe size {volume_ml} mL. "
                              f"Choose from {list(self.AIR_TITE_SYRINGES.keys())}")
         self.syringe_size_ml = volume_ml
-        # informational only
-        self.set_syringe_volume(volume_ml * 1000, "ul")
-        return self.set_diameter(diameter)
+        # informational only; one write covers both svolume and diameter
+        return self.send_many([f"svolume {volume_ml * 1000} ul", cmd])
 
     def set_diameter(self, mm: float) -> str:
         return self.send(f"diameter {mm:.3f}")
@@ -96,6 +145,8 @@ class PhdUltraPump(Pump):
 
     # ---------- run control ----------
     def _set_rate_sync(self, rate_ul_min: float, unit: str = "ul/min") -> str:
+        if unit == "ul/min":
+            return self.send(self._IRATE_FMT % rate_ul_min)
         return self.send(f"irate {rate_ul_min:.4g} {unit}")
 
     def clear_volume_counter(self) -> str:
@@ -110,25 +161,41 @@ class PhdUltraPump(Pump):
     def _dispense_sync(self, vol_ul: float, rate_ul_min: float) -> None:
         """Blocking dispense helper (synchronous).
 
-        This keeps the original behavior: start the run and sleep until the
-        estimated duration has passed. Higher-level async callers should use
-        the async wrapper `dispense` which runs this in a thread.
+        Starts the run, sleeps through the bulk of the estimated duration,
+        then polls `status` so the call returns as soon as the pump reports
+        it has stopped instead of always waiting out the padded estimate.
+        Higher-level async callers should use the async wrapper `dispense`
+        which runs this in a thread.
         """
         if rate_ul_min <= 0:
             raise ValueError("rate_ul_min must be > 0")
         if not getattr(self, "ser", None):
             raise RuntimeError("Serial connection not configured")
 
-        self._set_rate_sync(rate_ul_min, "ul/min")
-        self.clear_volume_counter()
-        self.set_target_volume(vol_ul, "ul")
-        self.run()  # pump stops when target reached
+        # One flush covers rate, counter clear, target volume and the run
+        # command, cutting three pause stalls per dispense
+        self.send_many([
+            self._IRATE_FMT % rate_ul_min,
+            b"cvolume",
+            f"tvolume {vol_ul} ul",
+            b"irun",
+        ])  # pump stops when target reached
         duration_sec = vol_ul / rate_ul_min * 60  # seconds
-        duration_sec = duration_sec + 2  # small padding
-        time.sleep(duration_sec)
+        deadline = time.monotonic() + duration_sec + 2  # small padding
+        coarse = duration_sec * 0.9
+        if coarse > 0:
+            time.sleep(coarse)
+        poll = max(0.05, duration_sec * 0.02)
+        while time.monotonic() < deadline:
+            status = self.send("status").lower()
+            # The prompt ends in '*' (or 'T*' for target reached) once the
+            # plunger has stopped moving.
+            if status.endswith("*") or "stopped" in status:
+                break
+            time.sleep(poll)
 
     def withdraw(self) -> str:
-        if "withdraw" not in self.send("mode").lower():
+        if "withdraw" not in self._mode():
             raise RuntimeError("Current mode does not allow withdraw")
         return self.send("wrun")
 
@@ -149,6 +216,7 @@ class PhdUltraPump(Pump):
                 self.ser.close()
         except Exception:
             pass
+        self._mode_cache = None
 
     # ---------------- Async wrappers to satisfy Pump ABC ----------------
     async def dispense(self, vol_ul: float, rate_ul_min: float) -> None:  # type: ignore[override]
@@ -6,29 +6,122 @@
 # All rights reserved.
 # ------------------------------------------------------------------------------
 
+import asyncio
+import concurrent.futures
+import re
+import threading
 import time
+
+import numpy as np
 import serial
 
 from ..pump import Pump
 
+# First signed integer in a pump reply; compiled once so the progress hot
+# path never touches the re module cache, and bytes-level so replies are
+# parsed without an intermediate decode.
+_INT_RE = re.compile(rb'-?\d+')
+
+
+def _set_low_latency(ser):
+    """Best-effort low-latency setup for the USB-serial adapter.
+
+    Pump replies are short CR frames; with the default FTDI/CDC latency
+    timer each one can sit in the adapter for ~16 ms before the host sees
+    it, which dominates command round-trip time. Neither knob exists on
+    every platform/driver, so failures are ignored.
+    """
+    try:
+        ser.set_low_latency_mode(True)   # Linux: ASYNC_LOW_LATENCY
+    except (AttributeError, NotImplementedError, ValueError, OSError):
+        pass
+    try:
+        ser.set_buffer_size(rx_size=4096, tx_size=4096)  # Windows
+    except (AttributeError, ValueError, OSError):
+        pass
+
+
+def _calibration_curves(cal):
+    """Split a flat (direction, rate) -> steps/uL table into sorted
+    per-direction rate/steps arrays suitable for np.interp."""
+    xs, ys = {}, {}
+    for (direction, rate), spu in sorted(cal.items(), key=lambda kv: kv[0][1]):
+        xs.setdefault(direction, []).append(rate)
+        ys.setdefault(direction, []).append(spu)
+    return ({d: np.array(v) for d, v in xs.items()},
+            {d: np.array(v) for d, v in ys.items()})
+
 '''
 The purpose of this code is to control the VICI M6 pumps
 '''
 
 class VICI_M6_Pumps(Pump):
 
-    def __init__(self,  port='COM22', baud_rate=9600, timeout=1):
+    #TODO These calibration steps were manually calculated at each value, here to ensure accuracy
+    # Need a cleaner way to set these values
+    # Flat (direction, flow rate uL/min) -> steps/uL table, hoisted to the
+    # class so set_flow_rate is a single dict probe instead of rebuilding
+    # two nested dicts per call.
+    _CAL = {
+        ("dispensing", 1000): 2494.720,
+        ("dispensing", 1500): 2584.774,
+        ("dispensing", 200): 2426.062,
+        ("dispensing", 2000): 2440.881,
+        ("dispensing", 41.33): 2426.062,
+        ("aspirating", 1000): 2606.371104,
+        ("aspirating", 1500): 3166.612,
+        ("aspirating", 200): 2451.378376,
+        ("aspirating", 2000): 2955.059,
+        ("aspirating", 41.33): 2451.378376,
+    }
+    _DIR_MULT = {"aspirating": -1, "dispensing": 1}
+
+    # Sorted per-direction calibration curves derived from _CAL; rates off
+    # the table are linearly interpolated between neighbours instead of
+    # silently falling back to one hard-coded steps/uL.
+    _CAL_X, _CAL_Y = _calibration_curves(_CAL)
+
+    # Short read timeout so read_until returns almost immediately when the
+    # pump stays silent; acked commands return as soon as the CR arrives.
+    def __init__(self,  port='COM22', baud_rate=9600, timeout=0.05):
         super().__init__(f"VICI M6 Pump (port={port})")  # Initialize base class with name
 
         try:
-            self.ser = serial.Serial(port, baud_rate, timeout=timeout)
+            self.ser = serial.Serial(port, baud_rate, timeout=timeout,
+                                     write_timeout=0.2)
+            _set_low_latency(self.ser)
             print(f"Successfully initialized serial connection with VICI M6 pump.")
         except serial.SerialException as e:
             print(f"Failed to initialize serial connection with VICI M6 pump: {e}")
             self.ser = None
         self.direction = "aspirating"
         self.direction_multiplier = -1  # Default to aspirating
+        # Latest position frame parsed by the RX drain thread (int assignment
+        # is atomic in CPython, so no lock is needed around it)
+        self._last_pos = 0
+        self._rx_thread = None
+        self._rx_stop = threading.Event()
+        # Set by the RX thread whenever a complete frame lands, so waiters
+        # wake on actual device traffic instead of a fixed sleep cadence
+        self._ack = threading.Event()
+        # Single worker so concurrent pump coroutines queue up on the one
+        # serial port instead of interleaving commands on the default pool
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        # Serializes the async surface: one in-flight command/response pair
+        # (or pump cycle) per port at a time. Created lazily by
+        # _get_cmd_lock(): on Python 3.9 asyncio.Lock() binds the event loop
+        # at construction, and pumps are built from synchronous code before
+        # any loop is running, so an eager lock would raise "attached to a
+        # different loop" the first time coroutines contend under
+        # asyncio.run()
+        self._cmd_lock = None
+        # Scratch buffer send_command formats into, so each command costs
+        # one encode instead of an encode plus a concatenated bytes object
+        self._cmd_buf = bytearray(128)
         self._initialize_parameters()
+        # Setup packet with the constant A/D/VI values baked in once; VM and
+        # the start position are the only per-cycle slots left to splice
+        self._setup_fmt = f"A={self.A}\rD={self.D}\rVI={self.VI}\rVM={{vm}}\rP={{p}}\rPR P\r".encode()
 
     def _initialize_parameters(self):
         """Initialize all pump parameters and math constants."""
@@ -60,35 +153,58 @@ class VICI_M6_Pumps(Pump):
         self.pump_head_volume = 99.771  # Pump head volume (uL/rev)
         self.steps_per_ul = self.micro_steps_per_rev / self.pump_head_volume  # Steps per uL
         self.steps_per_ul_units = "steps/uL"
+        # Memoized VM per (direction, flow rate); repeat set_flow_rate calls
+        # with the same arguments skip the float math entirely
+        self._VM_cache = {}
+        # Fully precomputed (flow_rate_sec, steps_per_ul, VM) per calibrated
+        # (direction, rate) pair: the exact-match path in set_flow_rate is a
+        # single dict hit with no float math at all
+        self._FLOW_TABLE = {
+            (d, rate): (rate / 60.0, spu, abs(int(spu * rate / 60.0)))
+            for (d, rate), spu in self._CAL.items()
+        }
+        # Reciprocal steps/uL; progress math multiplies by this instead of
+        # dividing on every update (refreshed at the top of pump_solution)
+        self._inv_spu = 1.0 / self.steps_per_ul
 
     def set_flow_rate(self, flow_rate_min, direction):
         try:
             self.flow_rate_min = float(flow_rate_min)
             self.flow_rate_sec = self.flow_rate_min / 60.0
 
-            if direction not in ["aspirating", "dispensing"]:
+            mult = self._DIR_MULT.get(direction)
+            if mult is None:
                 print("Invalid direction. Must be 'aspirating' or 'dispensing'.")
                 return
 
             self.direction = direction
-            self.direction_multiplier = 1 if direction == "dispensing" else -1
-            #TODO These calibration steps were manually calculated at each value, here to ensure accuracy
-            # Need a cleaner way to set these values
-            calibration_values = {
-                "dispensing": {
-                    1000: 2494.720, 1500: 2584.774, 200: 2426.062, 2000: 2440.881, 41.33: 2426.062
-                },
-                "aspirating": {
-                    1000: 2606.371104, 1500: 3166.612, 200: 2451.378376, 2000: 2955.059, 41.33: 2451.378376
-                }
-            }
-
-            self.steps_per_ul = calibration_values[self.direction].get(self.flow_rate_min)
-            if not self.steps_per_ul:
-                print(f"No calibration data for flow rate {self.flow_rate_min} uL/min in {self.direction} mode.")
-                self.steps_per_ul = 2606.371104
-
-            self.VM = abs(int(self.steps_per_ul * self.flow_rate_sec))
+            self.direction_multiplier = mult
+
+            key = (direction, self.flow_rate_min)
+            row = self._FLOW_TABLE.get(key)
+            if row is not None:
+                # Calibrated rate: everything was computed at init
+                self.flow_rate_sec, self.steps_per_ul, self.VM = row
+                print(f"{direction.capitalize()} at {self.flow_rate_min} uL/min")
+                print(f"Steps per uL: {self.steps_per_ul}, VM: {self.VM} steps/sec")
+                return
+
+            spu = self._CAL.get(key)
+            if spu is None:
+                # Off-table rate: interpolate the calibration curve. np.interp
+                # clamps to the endpoints, so warn when the rate falls outside
+                # the calibrated span rather than pretending it's covered.
+                x = self._CAL_X[direction]
+                if not x[0] <= self.flow_rate_min <= x[-1]:
+                    print(f"Flow rate {self.flow_rate_min} uL/min is outside the calibrated "
+                          f"range [{x[0]}, {x[-1]}] for {direction}; using the nearest calibrated value.")
+                spu = float(np.interp(self.flow_rate_min, x, self._CAL_Y[direction]))
+            self.steps_per_ul = spu
+
+            VM = self._VM_cache.get(key)
+            if VM is None:
+                VM = self._VM_cache[key] = abs(int(self.steps_per_ul * self.flow_rate_sec))
+            self.VM = VM
 
             print(f"{direction.capitalize()} at {self.flow_rate_min} uL/min")
             print(f"Steps per uL: {self.steps_per_ul}, VM: {self.VM} steps/sec")
@@ -117,12 +233,40 @@ class VICI_M6_Pumps(Pump):
         """Send a command to the pump and wait for a response"""
         if verbose:
             print(f"Command {command}")
-        self.ser.write((command + '\r').encode())
-        time.sleep(0.1)
-        response = self.ser.read(self.ser.in_waiting)
+        data = command.encode('ascii')
+        n = len(data)
+        if n < len(self._cmd_buf):
+            self._cmd_buf[:n] = data
+            self._cmd_buf[n] = 0x0D  # CR terminator
+            self.ser.write(memoryview(self._cmd_buf)[:n + 1])
+        else:  # oversized command; fall back to a one-off allocation
+            self.ser.write(data + b'\r')
+        # Force the kernel TX queue out, then hand control back the moment
+        # the pump's CR-terminated ack lands (or after the short port
+        # timeout) instead of burning a fixed 100 ms sleep before reading.
+        self.ser.flush()
+        response = self.ser.read_until(b'\r', 256)
         if verbose:
             print(f"Command sent to the pump \"{response.decode()}\"")
 
+    def send_batch(self, commands, verbose=False):
+        """Send several commands as one CR-joined write.
+
+        The pump firmware buffers CR-separated commands, so the batch pays
+        a single write and flush; replies are drained one CR frame per
+        command, each bounded by the short port timeout.
+        """
+        if not self.ser or not self.ser.is_open:
+            print("Serial connection for VICI M6 Pumps is not open.")
+            return
+        if verbose:
+            print(f"Batch {commands}")
+        self.ser.write(b'\r'.join(c.encode('ascii') for c in commands) + b'\r')
+        self.ser.flush()
+        for _ in commands:
+            if not self.ser.read_until(b'\r', 256):
+                break  # timeout: no more acks coming
+
     def get_pump_parameters(self):
         print("Pump parameters:\n"
               f"The flow rate per minute is {self.flow_rate_min} {self.flow_rate_units_min}\n"
@@ -157,24 +301,69 @@ class VICI_M6_Pumps(Pump):
         except Exception as e:
             print(f"Error while stopping connection: {e}")
 
+    # ---- background RX drain -------------------------------------------------
+    def _rx_pump(self):
+        """Drain streamed `PR AL` position frames into self._last_pos.
+
+        Runs as a daemon thread while pump_solution monitors a move, so the
+        progress loop never does serial I/O of its own and no inbound frame
+        is dropped by a reset_input_buffer.
+        """
+        buf = b""
+        while not self._rx_stop.is_set():
+            n = self.ser.in_waiting
+            if n:
+                buf += self.ser.read(n)
+                # Keep only the most recent complete CR-terminated frame
+                frames = buf.split(b'\r')
+                buf = frames.pop()
+                for frame in reversed(frames):
+                    m = _INT_RE.search(frame)
+                    if m:
+                        self._last_pos = int(m.group())
+                        break
+                if frames:
+                    self._ack.set()
+            else:
+                time.sleep(0.005)
+
+    def _start_rx(self):
+        self._rx_stop.clear()
+        self._rx_thread = threading.Thread(target=self._rx_pump, daemon=True)
+        self._rx_thread.start()
+
+    def _stop_rx(self):
+        if self._rx_thread is not None:
+            self._rx_stop.set()
+            self._rx_thread.join(timeout=1)
+            self._rx_thread = None
+
     def get_current_position(self):
         """Get current position in microsteps"""
+        # While the RX thread owns the port, an active query would race with
+        # the streamed output — just report the latest parsed frame.
+        if self._rx_thread is not None and self._rx_thread.is_alive():
+            return self._last_pos
         # Clear any pending responses
         self.ser.reset_input_buffer()
         
         # Send position request command
         self.ser.write("PR P\r".encode())
-        time.sleep(0.2)  # Give more time to respond
-        
-        response = self.ser.read(self.ser.in_waiting)
+
+        # Read CR-terminated lines until one carries a number, bounded by the
+        # same 200 ms budget the old fixed sleep burned unconditionally; the
+        # common case returns after a few milliseconds.
         try:
-            response_text = response.decode(errors='ignore').strip()
-            # Try to find any number in the response
-            import re
-            numbers = re.findall(r'-?\d+', response_text)
-            if numbers:
-                return int(numbers[0])
-            return 0
+            deadline = time.monotonic() + 0.2
+            response = b""
+            while True:
+                response += self.ser.read_until(b'\r', 64)
+                m = _INT_RE.search(response)
+                if m:
+                    self._last_pos = int(m.group())
+                    return self._last_pos
+                if time.monotonic() >= deadline:
+                    return 0
         except Exception as e:
             print(f"Error reading position: {e}")
             return 0
@@ -191,10 +380,11 @@ class VICI_M6_Pumps(Pump):
             
         try:
             steps_moved = abs(current_position - start_position)
-            volume_moved = steps_moved / self.steps_per_ul
+            volume_moved = steps_moved * self._inv_spu
             percent_complete = min(100, (steps_moved / abs(total_microsteps)) * 100)
             
-            elapsed = time.time() - start_time
+            # start_time is a monotonic stamp from pump_solution
+            elapsed = time.monotonic() - start_time
             if elapsed > 0:
                 current_flow_rate = (volume_moved / elapsed) * 60  # Convert to ul/min
             else:
@@ -216,43 +406,75 @@ class VICI_M6_Pumps(Pump):
                 raise RuntimeError("Serial connection is not open")
 
             total_microsteps = int(self.steps_per_ul * volume)
+            # Hoist the per-update conversions: multiply by the reciprocal in
+            # the monitor path, and bake the direction sign in once
+            self._inv_spu = 1.0 / self.steps_per_ul
+            signed_microsteps = self.direction_multiplier * total_microsteps
             if self.flow_rate_sec == 0:
                 raise ValueError("Flow rate cannot be zero.")
 
             pump_time = abs(volume / self.flow_rate_sec)
-            start_time = time.time()
-            # Clear any pending commands and get initial position
+            # Bind the clock to a local: the monitor loop calls it several
+            # times per pass for the whole pump duration, and monotonic is
+            # immune to wall-clock jumps mid-cycle.
+            _now = time.monotonic
+            start_time = _now()
+            # Clear any pending commands and get initial position. Dropping
+            # both buffers and draining the SL 0 ack replaces the blanket
+            # 500 ms settle the acked protocol never actually needed.
+            self.ser.reset_output_buffer()
+            self.ser.reset_input_buffer()
             self.send_command("SL 0", verbose=False)
-            time.sleep(0.5)
+            # Let the kernel handle framing instead of spinning on in_waiting
+            # (each probe is an IOCTL); read_until blocks quietly until bytes
+            # arrive or the port timeout expires, bounded by the same 100 ms.
+            t0 = _now()
+            while not self.ser.read_until(b'\r', 64) and _now() - t0 < 0.1:
+                pass
+            self.ser.reset_input_buffer()  # discard stream remnants from a prior run
             start_position = self.get_current_position()
             print(f"Starting position: {start_position} steps")
 
-            # Set pump parameters
-            commands = [
-                f"A={self.A}", f"D={self.D}", f"VI={self.VI}", f"VM={self.VM}", f"P={start_position}", "PR P"
-            ]
-            for cmd in commands:
-                self.send_command(cmd, verbose=False)
-                time.sleep(0.1)  # Give the pump time to process each command
+            # Set pump parameters. The M6 accepts CR-separated commands in a
+            # single write, so the whole setup goes out as one pre-baked
+            # packet with one drain instead of six round-trips.
+            self.ser.write(self._setup_fmt
+                           .replace(b"{vm}", b"%d" % self.VM)
+                           .replace(b"{p}", b"%d" % start_position))
+            self.ser.read_until(b'\r', 256)  # drain acks
 
-            self.send_command(f"MA={self.direction_multiplier * total_microsteps}", verbose=False)
-            self.send_command("PR AL", verbose=False)
-            
-            # Monitor progress
+            # The move command and the position-stream request ride one write
+            self.send_batch([f"MA={signed_microsteps}", "PR AL"], verbose=False)
+
+            # Monitor progress; the RX thread drains the streamed position
+            # frames so this loop does no serial I/O and can wake briefly
+            self._start_rx()
             update_interval = 0.5  # Update every 0.5 seconds
             next_update = start_time
-            while time.time() - start_time < pump_time + 2:
-                if time.time() >= next_update:
-                    self.get_progress_info(start_position, total_microsteps, start_time, volume)
-                    next_update = time.time() + update_interval
-                time.sleep(0.1)
+            try:
+                # pump_time + 2 is the watchdog, not the wait: the loop exits
+                # as soon as the streamed position shows the move complete,
+                # so short dispenses don't pay the old fixed 2 s fudge.
+                while _now() - start_time < pump_time + 2:
+                    if abs(self._last_pos - start_position) >= total_microsteps:
+                        self.get_progress_info(start_position, total_microsteps, start_time, volume)
+                        break
+                    if _now() >= next_update:
+                        self.get_progress_info(start_position, total_microsteps, start_time, volume)
+                        next_update = _now() + update_interval
+                    # Wake when the RX thread flags a fresh frame (or after a
+                    # short timeout) rather than polling on a fixed sleep
+                    self._ack.wait(timeout=0.05)
+                    self._ack.clear()
+            finally:
+                self._stop_rx()
 
             self.stop()
             print("\nFinal position:")
             final_position = self.get_current_position()
             steps_moved = abs(final_position - start_position)
-            actual_volume = steps_moved / self.steps_per_ul
-            elapsed = time.time() - start_time
+            actual_volume = steps_moved * self._inv_spu
+            elapsed = _now() - start_time
             actual_flow_rate = (actual_volume / elapsed) * 60  # Convert to ul/min
             
             print(f"Completed {actual_volume:.1f} µL in {elapsed:.1f} seconds")
@@ -286,6 +508,7 @@ class VICI_M6_Pumps(Pump):
                 self.ser.close()
         except Exception:
             pass
+        self._io_pool.shutdown(wait=False)
         self._connected = False
         
     def connect(self) -> None:
@@ -295,21 +518,51 @@ class VICI_M6_Pumps(Pump):
         self.start()  # Use existing start method
         self._connected = True
     
+    def _get_cmd_lock(self) -> asyncio.Lock:
+        """Create the command lock on first async use, inside the running loop."""
+        if self._cmd_lock is None:
+            self._cmd_lock = asyncio.Lock()
+        return self._cmd_lock
+
     async def aspirate(self, flow_rate_ul_min: float, volume_ul: float) -> None:
-        """Async wrapper for aspirating operation."""
-        self.aspirating(flow_rate_ul_min, volume_ul)
-        
+        """Async wrapper for aspirating operation.
+
+        Runs the blocking helper on the pump's single-worker executor so a
+        multi-second pump cycle no longer stalls the event loop.
+        """
+        async with self._get_cmd_lock():
+            await asyncio.get_running_loop().run_in_executor(
+                self._io_pool, self.aspirating, flow_rate_ul_min, volume_ul)
+
     async def dispense(self, flow_rate_ul_min: float, volume_ul: float) -> None:
         """Async wrapper for dispensing operation."""
-        self.dispensing(flow_rate_ul_min, volume_ul)
-        
+        async with self._get_cmd_lock():
+            await asyncio.get_running_loop().run_in_executor(
+                self._io_pool, self.dispensing, flow_rate_ul_min, volume_ul)
+
+    async def command(self, command: str, verbose: bool = False) -> None:
+        """Issue a raw pump command from async code.
+
+        A full transport/protocol port (pyserial-asyncio style, with reader
+        callbacks on the loop) would mean the sync helpers no longer own the
+        port; until then the lock plus the single-worker executor provides
+        the same guarantee — one command/response pair in flight per port —
+        without blocking the event loop.
+        """
+        async with self._get_cmd_lock():
+            await asyncio.get_running_loop().run_in_executor(
+                self._io_pool, self.send_command, command, verbose)
+
     async def set_rate(self, flow_rate_ul_min: float) -> None:
         """Async wrapper for setting flow rate. Defaults to dispensing direction."""
-        self.set_flow_rate(flow_rate_ul_min, "dispensing")
-        
+        async with self._get_cmd_lock():
+            await asyncio.get_running_loop().run_in_executor(
+                self._io_pool, self.set_flow_rate, flow_rate_ul_min, "dispensing")
+
     async def stop_flow(self) -> None:
         """Async wrapper for stopping flow."""
-        self.stop()
+        async with self._get_cmd_lock():
+            await asyncio.get_running_loop().run_in_executor(self._io_pool, self.stop)
 
 
 '''
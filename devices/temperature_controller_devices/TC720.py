@@ -6,12 +6,51 @@
 # All rights reserved.
 # ------------------------------------------------------------------------------
 
-import serial
+import asyncio
+import logging
 import time
+
+import serial
+from functools import lru_cache
 from typing import Optional, Dict, Union
 
 from ..temperature_controller import TemperatureController
 
+# Per-command tracing at DEBUG; setpoint loops no longer pay a stdout
+# write-and-flush per call unless a debug handler is configured.
+log = logging.getLogger(__name__)
+
+
+def _set_low_latency(ser) -> None:
+    """Best-effort low-latency setup for the USB-serial adapter.
+
+    TC-720 replies are 8-byte frames; with the default FTDI/CDC latency
+    timer each one can sit in the adapter for ~16 ms before the host sees
+    it, which dominates poll round-trip time. Neither knob exists on every
+    platform/driver, so failures are ignored.
+    """
+    try:
+        ser.set_low_latency_mode(True)   # Linux: ASYNC_LOW_LATENCY
+    except (AttributeError, NotImplementedError, ValueError, OSError):
+        pass
+    try:
+        ser.set_buffer_size(rx_size=4096, tx_size=4096)  # Windows
+    except (AttributeError, ValueError, OSError):
+        pass
+
+
+def _frame(payload: bytes) -> bytes:
+    """Wrap a 6-byte command body in the TC-720 frame (* body checksum CR)."""
+    return b'*' + payload + b'%02x' % (sum(payload) & 0xFF) + b'\r'
+
+
+# Step-hold and PID workflows revisit a handful of setpoints over and over;
+# caching on the hundredths value makes repeat encodes a dict hit.
+@lru_cache(maxsize=256)
+def _encode_set_temp(temp_hundredths: int) -> bytes:
+    return _frame(b'1c' + b'%04x' % temp_hundredths)
+
+
 class TC720(TemperatureController):
     def __init__(self, name: str, port='COM12', baudrate=230400, timeout=1):
         super().__init__(name)
@@ -19,6 +58,13 @@ class TC720(TemperatureController):
         self.baudrate = baudrate
         self.timeout = timeout
         self.ser: Optional[serial.Serial] = None
+        # The two sensor queries never change; build them once so the
+        # polling path does no string formatting at all
+        self._QUERY_S1 = self._build_query('01')
+        self._QUERY_S4 = self._build_query('04')
+        # Last (timestamp, value) per sensor; lets high-rate status() polls
+        # coalesce into device reads at a bounded cadence
+        self._temp_cache: Dict[int, tuple] = {}
 
     # ---- Device lifecycle ----------------------------------------------------
 
@@ -27,6 +73,7 @@ class TC720(TemperatureController):
             self._connected = True
             return
         self.ser = serial.Serial(port=self.port, baudrate=self.baudrate, timeout=self.timeout)
+        _set_low_latency(self.ser)
         self._connected = True
         print(f"Connected to TC-720 on {self.port}")
 
@@ -46,25 +93,27 @@ class TC720(TemperatureController):
 
     # ---- TemperatureController interface --------------------------------------
 
-    def calculate_checksum(self, char_list):
+    def calculate_checksum(self, payload) -> bytes:
         """
         Calculates the checksum based on the TC-720 command protocol.
+
+        payload is the 6-byte command body. Iterating bytes yields the
+        character codes directly, so the checksum sum runs at C level with
+        no per-char ord(); the full frame comes back as bytes ready for a
+        single serial.write().
         """
-        first_6_chars = char_list[1:7]
-        total_sum = sum(ord(char) for char in first_6_chars)
-        hex_sum = hex(total_sum)[2:]
-        last_two_digits = hex_sum[-2:].zfill(2)
-        result_list = ['*'] + first_6_chars + list(last_two_digits) + ['\r']
-        return result_list
-
-    def convert_temp_to_bstc(self, temp_celsius):
+        if isinstance(payload, str):
+            payload = payload.encode('ascii')
+        return _frame(payload)
+
+    def convert_temp_to_bstc(self, temp_celsius: float) -> bytes:
         """
         Converts temperature to the bstc command with checksum for the TC-720 controller.
+
+        The frame is plain ASCII bytes: b'*1c' + 4 hex digits of the
+        setpoint in hundredths °C + 2 checksum digits + CR.
         """
-        temp_hundredths = int(temp_celsius * 100)
-        hex_temp = format(temp_hundredths, '04x')
-        bstc = ['*', '1', 'c'] + list(hex_temp) + ['XX', 'XX', '\r']
-        return self.calculate_checksum(bstc)
+        return _encode_set_temp(int(temp_celsius * 100) & 0xFFFF)
 
     def set_temperature(self, temp_celsius):
         """
@@ -82,46 +131,75 @@ class TC720(TemperatureController):
             raise ValueError(f"Temperature must be between 0°C and 100°C, got {temp_celsius}°C")
             
         bstc = self.convert_temp_to_bstc(temp_celsius)
-        print(f"Setting temperature to {temp_celsius} °C with command: {''.join(bstc)}")
+        # Lazy %-formatting: no string is built when DEBUG is off
+        log.debug("Setting temperature to %s C with command: %r", temp_celsius, bstc)
 
         if not self.ser or not self.ser.is_open:
             raise RuntimeError("Device is not connected")
 
-        for char in bstc:
-            self.ser.write(char.encode())
-            time.sleep(0.01)  # Short delay for proper command transmission
+        # One write for the whole frame: the controller only needs the bytes
+        # in order, and a 10-byte frame drains in <0.5 ms at 230400 baud, so
+        # the old per-character write + 10 ms sleep was pure dead time.
+        self.ser.write(bstc)
+        self.ser.flush()
 
-        print("Temperature set successfully!")
+        log.debug("Temperature set successfully")
 
     def _build_query(self, cc):  # cc: '01' (INPUT1) or '04' (INPUT2)
-        return self.calculate_checksum(['*'] + list(cc) + list('0000') + ['XX', 'XX', '\r'])
+        return self.calculate_checksum(cc.encode('ascii') + b'0000')
+
+    def read_temperature(self, sensor=1, max_age_s=0.0):
+        """Read a sensor in °C.
 
-    def read_temperature(self, sensor=1):
-        cc = '01' if sensor == 1 else '04'
-        cmd = self._build_query(cc)
+        max_age_s > 0 returns the last reading if it is younger than that,
+        so a dashboard polling faster than the device needs to be asked
+        does not occupy the serial line on every tick.
+        """
+        if max_age_s:
+            cached = self._temp_cache.get(sensor)
+            if cached is not None and time.monotonic() - cached[0] < max_age_s:
+                return cached[1]
+
+        cmd = self._QUERY_S1 if sensor == 1 else self._QUERY_S4
         self.ser.reset_input_buffer()
-        for ch in cmd:
-            self.ser.write(ch.encode())
-            time.sleep(0.005)
+        self.ser.write(cmd)
+        self.ser.flush()
 
         resp = self.ser.read(8)  # expects: * D D D D S S ^
         if len(resp) < 8 or resp[0:1] != b'*':
             raise IOError(f"Unexpected response: {resp!r}")
 
-        dddd = resp[1:5].decode('ascii')   # hex value in hundredths °C (signed 16-bit)
-        # optional checksum verify for the 4 data chars:
-        if resp[5:7].decode('ascii') != format(sum(ord(c) for c in dddd) & 0xFF, '02x'):
+        # Verify the 4 data chars straight from the bytes slice; summing a
+        # bytes object needs no decode or re-ord, and comparing ints avoids
+        # even the 2-byte format per read
+        try:
+            got = int(resp[5:7], 16)
+        except ValueError:
+            raise IOError(f"Unexpected response: {resp!r}")
+        if got != (sum(resp[1:5]) & 0xFF):
             raise IOError("Checksum mismatch")
 
-        val = int(dddd, 16)
+        val = int(resp[1:5], 16)  # hex value in hundredths °C (signed 16-bit)
         if val >= 0x8000:  # handle negatives (two's complement, 16-bit)
             val -= 0x10000
-        return val / 100.0  # °C
+        temp_c = val / 100.0  # °C
+        self._temp_cache[sensor] = (time.monotonic(), temp_c)
+        return temp_c
     
+    # ---- Async wrappers --------------------------------------------------------
+    # Same pattern as the pump and ender3 drivers: the blocking serial
+    # round-trips run on a worker thread so one event loop can poll the
+    # controller alongside pump dispenses and handler moves.
+    async def set_temperature_async(self, temp_celsius) -> None:
+        await asyncio.to_thread(self.set_temperature, temp_celsius)
+
+    async def read_temperature_async(self, sensor=1) -> float:
+        return await asyncio.to_thread(self.read_temperature, sensor)
+
     # ---- Status monitoring ---------------------------------------------------
     def status(self) -> dict:
         try:
-            t = self.read_temperature(1)
+            t = self.read_temperature(1, max_age_s=0.5)
             return {"ok": True, "code": "ok", "msg": f"T={t:.2f}C"}
         except Exception as e:
             return {"ok": False, "code": "no_response", "msg": str(e)}
@@ -13,15 +13,25 @@ import csv
 import numpy as np
 from datetime import datetime
 import threading
-import time
 from typing import List, Optional
 
 
-# set headless backend before pyplot
-import matplotlib
+# matplotlib is only needed by the save_*/_dump_final_plot paths, and its
+# import costs a few hundred ms; headless logging deployments that never
+# plot should not pay that at module load. Imported lazily on first plot.
+_plt = None
 
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+
+def _ensure_plt():
+    global _plt
+    if _plt is None:
+        import matplotlib
+
+        matplotlib.use("Agg")  # set headless backend before pyplot
+        import matplotlib.pyplot as plt
+
+        _plt = plt
+    return _plt
 
 #from safetensors.flax import save_file
 # The gilson liquid handler uses windows 32 bit and if this is used we need to use python 32 bit instead of 64
@@ -97,18 +107,52 @@ class Ocean_Optics_UV_vis:
         self.spectra_sum = None
         self.wavelengths = None
 
+        # Scratch buffers for calculate_absorbance_spectrum: allocated once
+        # at the spectrum length and reused, so the per-measurement path does
+        # no full-spectrum allocations
+        self._absorbance_buf = None
+        self._absorbance_tmp = None
+        # Reused destination for the raw spectrum; each scan copies into it
+        # instead of allocating a fresh array
+        self._raw_buf = None
+
+        # One Figure/Axes reused by every plot method; plt.figure() setup and
+        # teardown is not paid again for each intermediate save
+        self._fig = None
+        self._ax = None
+
         if target_wavelengths is None:
             self.target_wavelengths = [409.0]
         else:
             self.target_wavelengths = [float(wl) for wl in target_wavelengths]
         self.absorbance_at_target_wavelength = None
 
+        # Linear-interp coefficients for the target wavelengths, rebuilt only
+        # when the wavelength axis or the targets change; the monitoring loop
+        # then extracts its handful of values with a few multiplies instead
+        # of a full np.interp search over the spectrum
+        self._interp_idx = None
+        self._interp_w = None
+        self._interp_wl = None
+        # Reused output for get_absorbance_at_target_wavelengths
+        self._A_out = None
+
         # Thread control
         self._stop_flag: Optional[threading.Event] = None
         self._worker_thread: Optional[threading.Thread] = None
         self._csv_file_path = None
         self._csv_writer = None
         self._start_time: Optional[datetime] = None
+        # Pending continuous-monitoring rows; written in batches so a long
+        # run does not pay a syscall per measurement
+        self._row_buf: List[list] = []
+        # Continuous-logging backend state; HDF5 handles stay None unless
+        # start_continuous is asked for log_format="hdf5"
+        self._log_format = "csv"
+        self._log_path = None
+        self._h5_file = None
+        self._h5_times = None
+        self._h5_A = None
 
     """
     Measures the UV-VIS spectrum and returns the intensity at a specific wavelength.
@@ -150,6 +194,10 @@ class Ocean_Optics_UV_vis:
         print(f"Hardware default scans-to-average: {actual}")
         self.initialized = True
 
+        # The wavelength axis is fixed by the hardware; fetch it once here
+        # instead of re-allocating it on every scan
+        self.wavelengths = np.asarray(self.device.get_wavelengths(), dtype=np.float64)
+
     #Obtains all the information about the device
     def retrieve_Ocean_Optics_Model(self):
         try:
@@ -188,6 +236,7 @@ class Ocean_Optics_UV_vis:
         #This input is a list of target wavelengths that we wish to record to track the progress of the reaction
         try:
             self.target_wavelengths = target_wavelengths
+            self._interp_wl = None  # coefficients are stale for new targets
             print(f"Set target wavelengths to {self.target_wavelengths}")
         except:
             print(f"Failed to set target wavelengths to {target_wavelengths}")
@@ -204,6 +253,15 @@ class Ocean_Optics_UV_vis:
     def get_output_directory(self):
         return self.output_dir
 
+    # Lazily creates the shared Figure/Axes on first use, afterwards just
+    # clears the axes for the next plot
+    def _get_axes(self):
+        if self._fig is None:
+            self._fig, self._ax = _ensure_plt().subplots()
+        else:
+            self._ax.clear()
+        return self._fig, self._ax
+
     # This records the UV-VIS Spectrum at a particular time point
     def recording_UV_VIS_Spectrum(self):
         self.ensure_init()
@@ -217,9 +275,19 @@ class Ocean_Optics_UV_vis:
         try:
 
             #This function returns a one-dimensional array of pixel values, stored as doubles.
-            self.raw_spectrum = np.array(self.device.get_formatted_spectrum())
-
-            self.wavelengths = np.array(self.device.get_wavelengths())
+            # Copied into a preallocated buffer: a fast monitoring loop does
+            # not allocate a new full-spectrum array per scan
+            spec = self.device.get_formatted_spectrum()
+            buf = self._raw_buf
+            if buf is None or buf.size != len(spec):
+                buf = self._raw_buf = np.empty(len(spec), dtype=np.float64)
+            buf[:] = spec
+            self.raw_spectrum = buf
+
+            # Wavelengths were fetched once at initialization; only refetch
+            # if something cleared them
+            if self.wavelengths is None:
+                self.wavelengths = np.asarray(self.device.get_wavelengths(), dtype=np.float64)
             print("Spectra averaged successfully.")
 
         #Something went wrong when performing this scan
@@ -270,25 +338,22 @@ class Ocean_Optics_UV_vis:
         csv_path = outdir / f"{base}.csv"
         png_path = outdir / f"{base}.png"
 
-        # CSV
-        with open(csv_path, "w", newline="") as fp:
-            w = csv.writer(fp)
-            w.writerow(["Wavelength (nm)", "Intensity (raw dark)"])
-            for wl, inten in zip(self.wavelengths, self.dark_spectrum):
-                w.writerow([wl, inten])
+        # CSV — one vectorized write, same pattern as save_and_plot, instead
+        # of a Python-level csv.writer call per pixel
+        np.savetxt(csv_path, np.column_stack((self.wavelengths, self.dark_spectrum)),
+                   delimiter=",", header="Wavelength (nm),Intensity (raw dark)", comments="")
         print(f"Dark spectrum CSV saved to {csv_path}")
 
         # PNG
-        plt.figure()
-        plt.plot(self.wavelengths, self.dark_spectrum, label="Dark")
-        plt.xlabel("Wavelength (nm)")
-        plt.ylabel("Intensity")
-        plt.title("Dark Spectrum")
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(png_path, dpi=600)
-        plt.close()
+        fig, ax = self._get_axes()
+        ax.plot(self.wavelengths, self.dark_spectrum, label="Dark")
+        ax.set_xlabel("Wavelength (nm)")
+        ax.set_ylabel("Intensity")
+        ax.set_title("Dark Spectrum")
+        ax.legend()
+        ax.grid(True)
+        fig.tight_layout()
+        fig.savefig(png_path, dpi=600)
         print(f"Dark spectrum plot saved to {png_path}")
 
     # Saves the blank spectrum to a CSV and a PNG file
@@ -306,23 +371,20 @@ class Ocean_Optics_UV_vis:
         csv_path = outdir / f"{base}.csv"
         png_path = outdir / f"{base}.png"
 
-        with open(csv_path, "w", newline="") as fp:
-            w = csv.writer(fp)
-            w.writerow(["Wavelength (nm)", "Intensity (raw blank)"])
-            for wl, inten in zip(self.wavelengths, self.blank_spectrum):
-                w.writerow([wl, inten])
+        # One vectorized write, same pattern as save_and_plot
+        np.savetxt(csv_path, np.column_stack((self.wavelengths, self.blank_spectrum)),
+                   delimiter=",", header="Wavelength (nm),Intensity (raw blank)", comments="")
         print(f"Blank spectrum CSV saved to {csv_path}")
 
-        plt.figure()
-        plt.plot(self.wavelengths, self.blank_spectrum, label="Blank (solvent)")
-        plt.xlabel("Wavelength (nm)")
-        plt.ylabel("Intensity")
-        plt.title("Blank Spectrum")
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(png_path, dpi=600)
-        plt.close()
+        fig, ax = self._get_axes()
+        ax.plot(self.wavelengths, self.blank_spectrum, label="Blank (solvent)")
+        ax.set_xlabel("Wavelength (nm)")
+        ax.set_ylabel("Intensity")
+        ax.set_title("Blank Spectrum")
+        ax.legend()
+        ax.grid(True)
+        fig.tight_layout()
+        fig.savefig(png_path, dpi=600)
         print(f"Blank spectrum plot saved to {png_path}")
 
     # Loads dark_spectrum and if applicable load to the UV-Spectrum to the device
@@ -337,23 +399,12 @@ class Ocean_Optics_UV_vis:
         if not path.exists():
             raise FileNotFoundError(f"Dark spectrum CSV not found: {path}")
 
-        wavelength, intensity = [], []
-        with open(path, "r", newline="") as filepath:
-            dark_spectrum_csv_file = csv.reader(filepath)
+        # One C-level parse straight into contiguous float64 columns, instead
+        # of two Python float() calls and two list appends per pixel
+        data = np.loadtxt(path, delimiter=",", skiprows=1)
 
-            #This skips the header since it's not relevant to our data processing
-            header = next(dark_spectrum_csv_file, None)  # skip header
-            for row in dark_spectrum_csv_file:
-                if not row:
-                    continue
-                wavelength.append(float(row[0]))
-                intensity.append(float(row[1]))
-
-        wavelength = np.array(wavelength, dtype=float)
-        intensity = np.array(intensity, dtype=float)
-
-        self.wavelengths = wavelength
-        self.dark_spectrum = intensity
+        self.wavelengths = data[:, 0]
+        self.dark_spectrum = data[:, 1]
         print(f"Loaded dark spectrum from {path}")
 
         if apply_to_device:
@@ -376,23 +427,53 @@ class Ocean_Optics_UV_vis:
         if not path.exists():
             raise FileNotFoundError(f"Blank spectrum CSV not found: {path}")
 
-        wavelength, intensity = [], []
-        with open(path, "r", newline="") as file_path:
-            blank_spectrum_csv_file = csv.reader(file_path)
-            header = next(blank_spectrum_csv_file, None)  # skip header
-            for row in blank_spectrum_csv_file:
-                if not row:
-                    continue
-                wavelength.append(float(row[0]))
-                intensity.append(float(row[1]))
-
-        wavelength = np.array(wavelength, dtype=float)
-        intensity = np.array(intensity, dtype=float)
-
-        self.wavelengths = wavelength
-        self.blank_spectrum = intensity
+        # Same single-pass parse as load_dark_spectrum_from_csv
+        data = np.loadtxt(path, delimiter=",", skiprows=1)
+
+        self.wavelengths = data[:, 0]
+        self.blank_spectrum = data[:, 1]
         print(f"Loaded blank spectrum from {path}")
 
+    # Rebuilds the (index, weight) pairs used to pull the target wavelengths
+    # out of a spectrum; clamped at both ends exactly like np.interp
+    def _rebuild_target_interp(self):
+        wl = self.wavelengths
+        tw = np.asarray(self.target_wavelengths, dtype=np.float64)
+        idx = np.searchsorted(wl, tw).clip(1, wl.size - 1)
+        w = (tw - wl[idx - 1]) / (wl[idx] - wl[idx - 1])
+        np.clip(w, 0.0, 1.0, out=w)
+        self._interp_idx = idx
+        self._interp_w = w
+        self._interp_wl = wl
+
+    # Absorbance at the target wavelengths using the precomputed
+    # coefficients; O(len(targets)) instead of a search over the spectrum
+    def _targets_from_spectrum(self, spectrum, out=None):
+        if self._interp_wl is not self.wavelengths:
+            self._rebuild_target_interp()
+        idx, w = self._interp_idx, self._interp_w
+        if out is None:
+            return (1.0 - w) * spectrum[idx - 1] + w * spectrum[idx]
+        np.multiply(1.0 - w, spectrum[idx - 1], out=out)
+        out += w * spectrum[idx]
+        return out
+
+    # Absorbance at the target wavelengths straight from the raw and blank
+    # spectra: only the 2*len(targets) pixels bracketing the targets are
+    # clamped, divided and logged, so the monitoring loop never traverses
+    # the full spectrum at all
+    def _targets_from_raw(self):
+        if self.blank_spectrum is None or self.raw_spectrum is None:
+            raise RuntimeError("Need blank and sample spectra first")
+        if self._interp_wl is not self.wavelengths:
+            self._rebuild_target_interp()
+        idx, w = self._interp_idx, self._interp_w
+        eps = 1e-12
+        raw, blank = self.raw_spectrum, self.blank_spectrum
+        a0 = -np.log10(np.maximum(raw[idx - 1], eps) / np.maximum(blank[idx - 1], eps))
+        a1 = -np.log10(np.maximum(raw[idx], eps) / np.maximum(blank[idx], eps))
+        return (1.0 - w) * a0 + w * a1
+
     # Calculates the absorbance spectrum of our plot given the intensity
     def calculate_absorbance_spectrum(self):
 
@@ -402,12 +483,24 @@ class Ocean_Optics_UV_vis:
 
         #The purpose of this epsilon is to set the lowest value to 1e-12 so there are no divide by zero errors
         eps = 1e-12
-        self.blank_spectrum = np.maximum(self.blank_spectrum, eps)
-        self.raw_spectrum = np.maximum(self.raw_spectrum, eps)
+
+        # Reused scratch buffers: every ufunc below writes in place, so after
+        # the first call this whole computation allocates nothing, and the
+        # stored blank/raw spectra are no longer clipped destructively
+        buf = self._absorbance_buf
+        if buf is None or buf.shape != self.raw_spectrum.shape:
+            buf = self._absorbance_buf = np.empty_like(self.raw_spectrum, dtype=np.float64)
+            self._absorbance_tmp = np.empty_like(buf)
+        tmp = self._absorbance_tmp
 
         """Compute A = -log10[(I_sample - dark) / (I_blank - dark)]."""
         # blank_spectrum already includes dark subtraction and not included in the calculations
-        self.absorbance_spectrum = -np.log10(self.raw_spectrum / self.blank_spectrum)
+        np.maximum(self.raw_spectrum, eps, out=buf)
+        np.maximum(self.blank_spectrum, eps, out=tmp)
+        np.divide(buf, tmp, out=buf)
+        np.log10(buf, out=buf)
+        np.negative(buf, out=buf)
+        self.absorbance_spectrum = buf
 
     #Closes the UV-VIS spectrometer
     def close_device(self):
@@ -439,15 +532,14 @@ class Ocean_Optics_UV_vis:
                    delimiter=",", header="Wavelength (nm),Absorbance", comments="")
 
         # Saves the PNG at a particular timepoint during the Bayesian Optimization
-        plt.figure()
-        plt.plot(self.wavelengths, self.absorbance_spectrum)
-        plt.xlabel("Wavelength (nm)")
-        plt.ylabel("Absorbance")
-        plt.title(f"Absorbance (target {self.target_wavelengths} nm)")
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(png_path, dpi=600)
-        plt.close()
+        fig, ax = self._get_axes()
+        ax.plot(self.wavelengths, self.absorbance_spectrum)
+        ax.set_xlabel("Wavelength (nm)")
+        ax.set_ylabel("Absorbance")
+        ax.set_title(f"Absorbance (target {self.target_wavelengths} nm)")
+        ax.grid(True)
+        fig.tight_layout()
+        fig.savefig(png_path, dpi=600)
 
         return csv_path, png_path
 
@@ -463,45 +555,100 @@ class Ocean_Optics_UV_vis:
                 "No absorbance spectrum available; run calculate_absorbance_spectrum() first"
             )
 
-        # numpy.interp will linearly interpolate (and clamp at ends) for you
-        self.absorbance_at_target_wavelengths = np.interp(self.target_wavelengths, self.wavelengths, self.absorbance_spectrum)
+        # Precomputed (index, weight) pairs do the same linear interpolation
+        # (clamped at ends) as np.interp, but without the per-call binary
+        # search; the result lands in a reused output array
+        out = self._A_out
+        if out is None or out.size != len(self.target_wavelengths):
+            out = self._A_out = np.empty(len(self.target_wavelengths), dtype=np.float64)
+        self.absorbance_at_target_wavelengths = self._targets_from_spectrum(
+            self.absorbance_spectrum, out=out
+        )
 
         return self.absorbance_at_target_wavelengths
 
     #Will begin recording the UV-VIS absorbance on a seperate thread
-    def start_continuous(self, name = None):
+    def start_continuous(self, name = None, log_format = "csv"):
         """
         Start background thread to log absorbance at all target wavelengths.
+
+        log_format "csv" (default) writes the usual text log; "hdf5" appends
+        to chunked, gzip-compressed datasets instead — several times smaller
+        on disk for long runs and reloaded without any text parsing.
+        Requires the optional h5py package.
         """
         if self._worker_thread and self._worker_thread.is_alive():
             print("Continuous monitoring already running")
             return
+        if log_format not in ("csv", "hdf5"):
+            raise ValueError(f"log_format must be 'csv' or 'hdf5', got {log_format!r}")
 
         self._stop_flag = threading.Event()
-        self._csv_file_path = open(self.save_file_path, "w", newline="")
-        self._csv_writer = csv.writer(self._csv_file_path)
-        header = ["Time(s)"] + [str(wl) for wl in self.target_wavelengths]
-        self._csv_writer.writerow(header)
+        self._log_format = log_format
+        if log_format == "hdf5":
+            import h5py  # optional dependency; only needed for HDF5 logging
+            self._log_path = self.save_file_path.with_suffix(".h5")
+            num_targets = len(self.target_wavelengths)
+            self._h5_file = h5py.File(self._log_path, "w")
+            self._h5_times = self._h5_file.create_dataset(
+                "times", shape=(0,), maxshape=(None,), dtype=np.float64,
+                chunks=(1024,), compression="gzip", compression_opts=4)
+            self._h5_A = self._h5_file.create_dataset(
+                "absorbance", shape=(0, num_targets), maxshape=(None, num_targets),
+                dtype=np.float64, chunks=(1024, num_targets),
+                compression="gzip", compression_opts=4)
+            self._h5_A.attrs["wavelengths"] = self.target_wavelengths
+        else:
+            # Large OS-level buffer plus batched writerows below: rows
+            # coalesce into few big writes instead of one small write per
+            # measurement
+            self._log_path = self.save_file_path
+            self._csv_file_path = open(self.save_file_path, "w", newline="", buffering=1 << 16)
+            self._csv_writer = csv.writer(self._csv_file_path)
+            header = ["Time(s)"] + [str(wl) for wl in self.target_wavelengths]
+            self._csv_writer.writerow(header)
         self._start_time = datetime.now()
+        self._row_buf = []
+
+        def _flush_rows():
+            if not self._row_buf:
+                return
+            if self._h5_file is not None:
+                arr = np.asarray(self._row_buf)
+                n0 = self._h5_times.shape[0]
+                n1 = n0 + arr.shape[0]
+                self._h5_times.resize((n1,))
+                self._h5_times[n0:n1] = arr[:, 0]
+                self._h5_A.resize((n1, self._h5_A.shape[1]))
+                self._h5_A[n0:n1] = arr[:, 1:]
+            else:
+                self._csv_writer.writerows(self._row_buf)
+            self._row_buf.clear()
 
         def _worker():
             try:
                 while not self._stop_flag.is_set():
                     self.recording_UV_VIS_Spectrum()
-                    self.calculate_absorbance_spectrum()
-                    A = np.interp(
-                        self.target_wavelengths,
-                        self.wavelengths,
-                        self.absorbance_spectrum,
-                    )
+                    A = self._targets_from_raw()
                     t = (datetime.now() - self._start_time).total_seconds()
-                    self._csv_writer.writerow([t] + A.tolist())
-                    time.sleep(self.measurement_interval)
+                    self._row_buf.append([t, *A])
+                    if len(self._row_buf) >= 64:
+                        _flush_rows()
+                    # Interruptible sleep: returns True the moment
+                    # stop_continuous() sets the flag, instead of making the
+                    # shutdown wait out the rest of the interval
+                    if self._stop_flag.wait(self.measurement_interval):
+                        break
             except Exception:
                 print("Error in continuous monitoring worker")
             finally:
                 try:
-                    self._csv_file_path.close()
+                    _flush_rows()
+                    if self._h5_file is not None:
+                        self._h5_file.close()
+                        self._h5_file = None
+                    else:
+                        self._csv_file_path.close()
                 except Exception:
                     pass
                 self._dump_final_plot(name)
@@ -523,24 +670,33 @@ class Ocean_Optics_UV_vis:
 
     def _dump_final_plot(self, name = None):
         """
-        Read the CSV and save a final multi-wavelength timecourse plot.
+        Read the monitoring log back and save a final multi-wavelength
+        timecourse plot.
         """
         try:
-            import pandas as pd
-            df = pd.read_csv(self.save_file_path)
-            plt.figure()
-            for wl in self.target_wavelengths:
-                plt.plot(df["Time(s)"], df[str(wl)], label=f"{wl} nm")
-            plt.xlabel("Time (s)")
-            plt.ylabel("Absorbance")
-            plt.legend()
-            plt.tight_layout()
+            if self._log_format == "hdf5":
+                import h5py
+                with h5py.File(self._log_path, "r") as h5:
+                    t = h5["times"][:]
+                    A = h5["absorbance"][:]
+            else:
+                # Plain numeric columns: np.loadtxt parses them straight into
+                # a contiguous array without dragging in the pandas import
+                arr = np.loadtxt(self.save_file_path, delimiter=",", skiprows=1, ndmin=2)
+                t = arr[:, 0]
+                A = arr[:, 1:]
+            fig, ax = self._get_axes()
+            for i, wl in enumerate(self.target_wavelengths):
+                ax.plot(t, A[:, i], label=f"{wl} nm")
+            ax.set_xlabel("Time (s)")
+            ax.set_ylabel("Absorbance")
+            ax.legend()
+            fig.tight_layout()
             suffix = f"_{name}" if name else ""
             png = self.output_dir / f"UV_VIS_timecourse{suffix}.png"
             pdf = self.output_dir / f"UV_VIS_timecourse{suffix}.pdf"
-            plt.savefig(png, dpi=600)
-            plt.savefig(pdf)
-            plt.close()
+            fig.savefig(png, dpi=600)
+            fig.savefig(pdf)
             print(f"Final plots saved to {png} and {pdf}")
         except Exception:
             print("Failed to generate final plot")